@@ -1,16 +1,74 @@
-import cv2
-import mediapipe as mp
-import pyautogui
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import os
+import threading
+import glob
+import math
+import signal
+import argparse
+import importlib
+import gc
+import socket
+import stat
+import sys
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+from collections import deque
+
+# Startup reference for the launch-to-first-frame measurement
+LAUNCH_TIME = time.perf_counter()
+
+class _LazyModule:
+    """Stand-in for a heavy module that is only imported on first use.
+    
+    Importing OpenCV, MediaPipe and PyAutoGUI takes seconds, the configuration
+    window should not wait for them. After the import the module global is
+    replaced by the real module, so later lookups cost nothing extra.
+    """
+    def __init__(self, module_name, alias):
+        self._module_name = module_name
+        self._alias = alias
+        self._module = None
+        self._lock = threading.Lock()
+        
+    def load(self):
+        """Import the module now and return it"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._module_name)
+                    globals()[self._alias] = self._module
+        return self._module
+        
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+        
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.load(), name, value)
+
+cv2 = _LazyModule("cv2", "cv2")
+mp = _LazyModule("mediapipe", "mp")
+np = _LazyModule("numpy", "np")
+pyautogui = _LazyModule("pyautogui", "pyautogui")
+
+def load_heavy_modules(*aliases):
+    """Import deferred modules (all of them by default), e.g. from a background thread"""
+    for alias in aliases or ("np", "cv2", "mp", "pyautogui"):
+        module = globals()[alias]
+        if isinstance(module, _LazyModule):
+            module.load()
 
 class HandySlidesConfig:
-    def __init__(self):
-        self.config_file = "handyslides_config.json"
-        self.settings = self.load_config()
+    def __init__(self, config_file="handyslides_config.json", settings=None):
+        self.config_file = config_file
+        # Explicit settings (e.g. one camera of a multi-camera session) skip the file
+        self.settings = settings if settings is not None else self.load_config()
         
     def load_config(self):
         """Load saved settings or use defaults"""
@@ -18,14 +76,51 @@ class HandySlidesConfig:
             "right_arm_action": "next",  # "next" or "previous"
             "left_arm_action": "previous",
             "sensitivity": 0.05,
-            "cooldown": 1.0,
+            "cooldown": 0.0,  # Minimum time between presses, each raise fires once anyway
             "show_debug": True,
             "powerpoint_keys": True,  # True for arrows, False for Page Up/Down
             "language": "en",  # "pt" for Portuguese, "en" for English, "fr" for French
-            "mirror_camera": False # True to mirror camera feed
+            "mirror_camera": False, # True to mirror camera feed
+            "preview_fps": 15,  # Max preview refresh rate, detection runs at full camera rate
+            "inference_width": 640,  # Working width for pose inference, 0 for full resolution
+            "roi_tracking": True,  # Crop inference to the area around the last detected pose
+            "roi_padding": 0.3,  # Margin around the tracked pose, relative to its size
+            "profile": False,  # Show per-stage timings in the preview
+            "trace_file": "",  # Write a Chrome trace of all stages here on exit (with profile on)
+            "release_ratio": 0.5,  # Arm counts as lowered below sensitivity * release_ratio
+            "confirm_frames": 2,  # Consecutive frames needed to confirm a raise or a release
+            "model_complexity": 1,  # Best MediaPipe pose model to use (0, 1 or 2)
+            "governor": True,  # Lower model complexity / skip frames when over the frame budget
+            "target_fps": 30,  # Frame budget for the governor
+            "idle_fps": 5,  # Inference rate while no pose is detected
+            "headless": False,  # No preview window, stop with Ctrl+C or a termination signal
+            "debug_sample_every": 30,  # Log landmarks every N frames, 0 for state changes only
+            "debug_log_file": "",  # Also write debug records as JSON lines to this file
+            "camera_index": 0,
+            "camera_probe": True,  # Find the fastest capture mode on first use of a camera
+            "camera_profiles": {},  # Cached capture mode per camera index, filled by the probe
+            "inference_process": False,  # Run pose inference in a separate worker process
+            "cameras": [],  # Two or more {"index", "priority", "cooldown"} entries for multi-presenter mode
+            "arbitration_window": 0.5,  # After a press, lower or equal priority cameras are ignored this long
+            "key_output": "pyautogui",  # "pyautogui", "null" or "socket:PORT" (UDP on localhost, for tests)
+            "async_keys": True,  # Send keys from a dispatcher thread instead of the detection loop
+            "hot_reload": True,  # Apply changes to this file while HandySlides is running
+            "gesture_rules": [],  # Custom gestures, empty for the left and right arm actions
+            "gesture_window": 32,  # Frames of landmarks kept for gesture rules
+            "record_landmarks": "",  # Append every frame's landmarks to this file for replay_landmarks.py
+            "event_bus": "",  # Publish gesture events as JSON lines on "tcp:PORT" (localhost) or "unix:PATH"
+            "event_queue_size": 256,  # Events kept per subscriber, the oldest are dropped for slow ones
+            "motion_gate": True,  # Skip inference while the scene is static and the arms are down
+            "motion_threshold": 0.005,  # Fraction of changed pixels that counts as motion
+            "static_infer_interval": 1.0,  # Seconds between inferences on a static scene
+            "smoothing": True,  # One Euro filter on the landmarks before gesture detection
+            "smoothing_min_cutoff": 1.5,  # Hz, lower smooths still landmarks more
+            "smoothing_beta": 5.0,  # How fast the smoothing lets go when landmarks move
+            "prediction_time": 0.08  # Seconds ahead a fast raise is extrapolated, 0 to only use the position
         }
         
-        if os.path.exists(self.config_file):
+        # No file (None) gives the defaults, e.g. for benchmarks
+        if self.config_file and os.path.exists(self.config_file):
             try:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     saved_settings = json.load(f)
@@ -39,6 +134,26 @@ class HandySlidesConfig:
         """Save current settings"""
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            
+    def save_camera_profiles(self, profiles):
+        """Cache camera profiles (index -> profile) in the settings and the file.
+        
+        Only camera_profiles is written back, the in-memory settings may hold
+        command line overrides such as --headless that must not be saved.
+        """
+        self.settings.setdefault("camera_profiles", {}).update(profiles)
+        if not self.config_file:
+            return
+        saved_settings = {}
+        if os.path.exists(self.config_file):
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    saved_settings = json.load(f)
+            except (OSError, ValueError):
+                return  # Do not replace a file we cannot read
+        saved_settings.setdefault("camera_profiles", {}).update(profiles)
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump(saved_settings, f, indent=2, ensure_ascii=False)
 
 # Translation dictionary
 TRANSLATIONS = {
@@ -55,6 +170,7 @@ TRANSLATIONS = {
         "options": "Opções",
         "show_debug": "Mostrar informações de debug",
         "use_arrows": "Usar setas do teclado (desmarque para Page Up/Down)",
+        "headless": "Sem janela de pré-visualização (terminar com Ctrl+C)",
         "mirror_camera": "Espelhar imagem da câmara",
         "language": "Idioma:",
         "test_camera": "Testar Câmara",
@@ -64,6 +180,9 @@ TRANSLATIONS = {
         "start": "Iniciar",
         "camera_error": "Câmara não detectada ou não está a funcionar!",
         "camera_success": "Câmara está a funcionar corretamente!",
+        "stop_test": "Parar Teste",
+        "camera_opening": "A abrir a câmara...",
+        "preview_stats": "{fps:.0f} fps, latência {latency:.0f} ms",
         "invalid_config": "Configuração Inválida",
         "same_function": "Os dois braços não podem ter a mesma função!",
         "config_saved": "Configuração Guardada",
@@ -85,6 +204,7 @@ TRANSLATIONS = {
         "options": "Options",
         "show_debug": "Show debug information",
         "use_arrows": "Use keyboard arrows (uncheck for Page Up/Down)",
+        "headless": "No preview window (stop with Ctrl+C)",
         "mirror_camera": "Mirror camera image",
         "language": "Language:",
         "test_camera": "Test Camera",
@@ -94,6 +214,9 @@ TRANSLATIONS = {
         "start": "Start",
         "camera_error": "Camera not found or not working!",
         "camera_success": "Camera is working correctly!",
+        "stop_test": "Stop Test",
+        "camera_opening": "Opening camera...",
+        "preview_stats": "{fps:.0f} fps, {latency:.0f} ms latency",
         "invalid_config": "Invalid Configuration",
         "same_function": "Both arms cannot have the same function!",
         "config_saved": "Configuration Saved",
@@ -115,6 +238,7 @@ TRANSLATIONS = {
         "options": "Options",
         "show_debug": "Afficher les informations de débogage",
         "use_arrows": "Utiliser les flèches du clavier (décocher pour Page Haut/Bas)",
+        "headless": "Sans fenêtre d'aperçu (arrêter avec Ctrl+C)",
         "mirror_camera": "Miroir de l'image de la caméra",
         "language": "Langue :",
         "test_camera": "Tester la caméra",
@@ -124,6 +248,9 @@ TRANSLATIONS = {
         "start": "Démarrer",
         "camera_error": "Caméra non trouvée ou non fonctionnelle !",
         "camera_success": "La caméra fonctionne correctement !",
+        "stop_test": "Arrêter le test",
+        "camera_opening": "Ouverture de la caméra...",
+        "preview_stats": "{fps:.0f} fps, latence {latency:.0f} ms",
         "invalid_config": "Configuration invalide",
         "same_function": "Les deux bras ne peuvent pas avoir la même fonction !",
         "config_saved": "Configuration enregistrée",
@@ -134,10 +261,149 @@ TRANSLATIONS = {
     }
 }
 
+class CameraPreview:
+    """Open a camera and make small preview images on a background thread, for the settings window.
+    
+    The Tk thread polls take_thumbnail(), which returns the newest image as PPM
+    data. Once the pose model has loaded, the pose and the raise threshold of
+    each arm are drawn, so the sensitivity can be tuned live.
+    """
+    def __init__(self, source, pose_loader=None, max_fps=10, width=320):
+        self.source = source
+        self.pose_loader = pose_loader
+        self.frame_interval = 1.0 / max_fps
+        self.width = width
+        self.mirror = False  # Set by the Tk thread
+        self.sensitivity = 0.05
+        self.opened = False
+        self.failed = False
+        self.capture_fps = 0.0
+        self.latency = 0.0  # Seconds from capture to a ready preview image
+        self.buffers = FrameBuffers()
+        self._thumbnail = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pose_lock = threading.Lock()  # Held while the preview runs the shared pose model
+        self._finished = False
+        self._release_on_exit = False
+        self._thread = None
+        
+    def start(self):
+        """Open the camera and start making preview images"""
+        self._thread = threading.Thread(target=self._preview_loop, name="HandySlidesCameraPreview", daemon=True)
+        self._thread.start()
+        return self
+        
+    def _preview_loop(self):
+        try:
+            if self.source.open():
+                self.opened = True
+                self._capture_loop()
+            else:
+                self.failed = True
+        finally:
+            with self._lock:
+                self._finished = True
+                release = self._release_on_exit
+            if release:
+                self.source.release()
+                
+    def _capture_loop(self):
+        frames, count_start, next_thumbnail = 0, time.perf_counter(), 0.0
+        while not self._stop.is_set():
+            ret, frame, capture_time = self.source.read()
+            if not ret:
+                self.failed = True
+                break
+            if self._stop.is_set():
+                break  # Stopped during a slow read, detection may already own the pose model
+            frames += 1
+            now = time.perf_counter()
+            if now - count_start >= 1.0:
+                self.capture_fps = frames / (now - count_start)
+                frames, count_start = 0, now
+            if now < next_thumbnail:
+                continue
+            next_thumbnail = now + self.frame_interval
+            ppm = self._make_thumbnail(frame)
+            latency = time.time() - capture_time  # Capture timestamps are wall clock
+            self.latency = latency if not self.latency else 0.8 * self.latency + 0.2 * latency
+            with self._lock:
+                self._thumbnail = ppm
+                
+    def _make_thumbnail(self, frame):
+        """Downscale, draw the pose and thresholds, mirror, and encode as PPM"""
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        small = cv2.resize(frame, size, dst=self.buffers.get("small", (size[1], size[0], 3)), 
+                           interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=self.buffers.get("rgb", small.shape))
+        
+        loader = self.pose_loader
+        landmarks = None
+        if loader is not None and loader.ready():
+            with self._pose_lock:
+                if not self._stop.is_set():
+                    landmarks = loader.pose.process(rgb).pose_landmarks
+        if landmarks:
+            mp.solutions.drawing_utils.draw_landmarks(rgb, landmarks, mp.solutions.pose.POSE_CONNECTIONS)
+            for shoulder, wrist in ((LEFT_SHOULDER, LEFT_WRIST), (RIGHT_SHOULDER, RIGHT_WRIST)):
+                # A wrist above this line counts as a raised arm
+                x = landmarks.landmark[shoulder].x * size[0]
+                line_y = round((landmarks.landmark[shoulder].y - self.sensitivity) * size[1])
+                raised = landmarks.landmark[shoulder].y - landmarks.landmark[wrist].y > self.sensitivity
+                color = (0, 255, 0) if raised else (255, 165, 0)
+                cv2.line(rgb, (round(x - 40), line_y), (round(x + 40), line_y), color, 2)
+        if self.mirror:
+            rgb = cv2.flip(rgb, 1, dst=self.buffers.get("mirrored", rgb.shape))
+        return f"P6 {size[0]} {size[1]} 255\n".encode("ascii") + rgb.tobytes()
+        
+    def take_thumbnail(self):
+        """The newest preview image as PPM data, None if there is no new one"""
+        with self._lock:
+            thumbnail, self._thumbnail = self._thumbnail, None
+        return thumbnail
+        
+    def finished(self):
+        """True once the preview thread is done, after request_stop() or a camera failure"""
+        with self._lock:
+            return self._finished
+            
+    def request_stop(self):
+        """Ask the preview thread to stop, without waiting for it"""
+        self._stop.set()
+        
+    def detach(self):
+        """The still open camera of a finished preview, None if it did not open.
+        
+        Called before the thread is done, e.g. on a stalled camera, the preview
+        gives up the camera instead and closes it once the thread ends. Either way
+        the pose model is not used by the preview once this returns, it waits for
+        an inference in progress.
+        """
+        if not self.finished():
+            self.stop()
+            with self._pose_lock:
+                pass
+            return None
+        return self.source if self.opened and not self.failed else None
+        
+    def stop(self):
+        """Stop previewing and close the camera, without waiting for a slow open or read"""
+        self._stop.set()
+        with self._lock:
+            if not self._finished:
+                self._release_on_exit = True  # The preview thread closes it
+                return
+        self.source.release()
+
 class ConfigWindow:
     def __init__(self):
         self.config = HandySlidesConfig()
         self.root = tk.Tk()
+        self.pose_loader = None  # Used by the camera preview once loaded
+        self.preview = None
+        self.camera_source = None  # Camera left open by the preview for the detection
         
         # Set initial language
         self.current_language = self.config.settings.get("language", "en")
@@ -156,6 +422,7 @@ class ConfigWindow:
         self.keys_var = tk.BooleanVar(value=self.config.settings["powerpoint_keys"])
         self.language_var = tk.StringVar(value=self.current_language)
         self.mirror_var = tk.BooleanVar(value=self.config.settings["mirror_camera"])
+        self.headless_var = tk.BooleanVar(value=self.config.settings["headless"])
         
         # Convert arm values to translated text
         right_action = self.config.settings["right_arm_action"]
@@ -165,6 +432,7 @@ class ConfigWindow:
         self.left_arm_var = tk.StringVar(value=self.texts["next"] if left_action == "next" else self.texts["previous"])
         
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.cancel)
         
     def create_widgets(self):
         # Title
@@ -235,10 +503,10 @@ class ConfigWindow:
         
         self.cooldown_label = ttk.Label(self.advanced_frame, text=self.texts["cooldown"])
         self.cooldown_label.grid(row=1, column=0, sticky="w", pady=2)
-        self.cooldown_scale = ttk.Scale(self.advanced_frame, from_=0.5, to=3.0, 
+        self.cooldown_scale = ttk.Scale(self.advanced_frame, from_=0.0, to=3.0, 
                                        variable=self.cooldown_var, orient="horizontal", length=150)
         self.cooldown_scale.grid(row=1, column=1, padx=10, pady=2)
-        self.cooldown_value = ttk.Label(self.advanced_frame, text="1.0")
+        self.cooldown_value = ttk.Label(self.advanced_frame, text="0.0")
         self.cooldown_value.grid(row=1, column=2, pady=2)
         self.cooldown_scale.configure(command=lambda v: self.cooldown_value.configure(text=f"{float(v):.1f}"))
         
@@ -252,10 +520,22 @@ class ConfigWindow:
         self.keys_check = ttk.Checkbutton(self.options_frame, text=self.texts["use_arrows"], 
                                          variable=self.keys_var)
         self.keys_check.pack(anchor="w")
+        self.headless_check = ttk.Checkbutton(self.options_frame, text=self.texts["headless"], 
+                                              variable=self.headless_var)
+        self.headless_check.pack(anchor="w")
+        
+        # Camera preview, shown while testing the camera
+        self.preview_frame = ttk.Frame(main_frame)
+        self.preview_photo = None
+        self.preview_image = ttk.Label(self.preview_frame)
+        self.preview_image.pack()
+        self.preview_stats = ttk.Label(self.preview_frame, text="")
+        self.preview_stats.pack()
         
         # Buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill="x", pady=15)
+        self.button_frame = button_frame
         
         self.test_button = ttk.Button(button_frame, text=self.texts["test_camera"], 
                                      command=self.test_camera)
@@ -266,7 +546,7 @@ class ConfigWindow:
         self.restore_button.pack(side="left", padx=5)
         
         self.cancel_button = ttk.Button(button_frame, text=self.texts["cancel"], 
-                                       command=self.root.destroy)
+                                       command=self.cancel)
         self.cancel_button.pack(side="right", padx=5)
         
         self.start_button = ttk.Button(button_frame, text=self.texts["start"], 
@@ -392,8 +672,9 @@ class ConfigWindow:
         self.options_frame.configure(text=self.texts["options"])
         self.debug_check.configure(text=self.texts["show_debug"])
         self.keys_check.configure(text=self.texts["use_arrows"])
+        self.headless_check.configure(text=self.texts["headless"])
         
-        self.test_button.configure(text=self.texts["test_camera"])
+        self.test_button.configure(text=self.texts["stop_test" if self.preview else "test_camera"])
         self.restore_button.configure(text=self.texts["restore_defaults"])
         self.save_button.configure(text=self.texts["save_config"])
         self.cancel_button.configure(text=self.texts["cancel"])
@@ -403,13 +684,59 @@ class ConfigWindow:
         self.root.after(10, self.center_window)
         
     def test_camera(self):
-        """Test if camera is working"""
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+        """Start or stop the live camera preview, the camera opens in the background"""
+        if self.preview is not None:
+            self.stop_preview()
+            return
+        index = self.config.settings.get("camera_index", 0)
+        source = CameraSource(index, self.config.settings.get("camera_profiles", {}).get(str(index)))
+        self.preview = CameraPreview(source, self.pose_loader).start()
+        self.preview_stats.configure(text=self.texts["camera_opening"])
+        self.preview_frame.pack(fill="x", pady=5, before=self.button_frame)
+        self.test_button.configure(text=self.texts["stop_test"])
+        self.root.after(50, self.poll_preview)
+        
+    def poll_preview(self):
+        """Show the newest preview image, called from the Tk event loop"""
+        preview = self.preview
+        if preview is None:
+            return
+        if preview.failed:
+            self.stop_preview()
             messagebox.showerror(self.texts["error"], self.texts["camera_error"])
-        else:
-            messagebox.showinfo(self.texts["success"], self.texts["camera_success"])
-        cap.release()
+            return
+        # Settings being tuned apply to the preview right away
+        preview.mirror = self.mirror_var.get()
+        preview.sensitivity = self.sensitivity_var.get()
+        
+        thumbnail = preview.take_thumbnail()
+        if thumbnail is not None:
+            if self.preview_photo is None:
+                self.preview_photo = tk.PhotoImage(data=thumbnail, format="PPM")
+                self.preview_image.configure(image=self.preview_photo)
+            else:
+                self.preview_photo.configure(data=thumbnail, format="PPM")
+            self.preview_stats.configure(text=self.texts["preview_stats"].format(
+                fps=preview.capture_fps, latency=preview.latency * 1000))
+        self.root.after(50, self.poll_preview)
+        
+    def stop_preview(self):
+        """Close the preview and its camera"""
+        if self.preview is not None:
+            self.preview.stop()
+            self.preview = None
+        self.preview_frame.pack_forget()
+        self.preview_photo = None
+        self.preview_image.configure(image="")
+        self.test_button.configure(text=self.texts["test_camera"])
+        self.root.after(10, self.center_window)
+        
+    def cancel(self):
+        """Close the window without starting"""
+        if self.preview is not None:
+            self.preview.stop()
+            self.preview = None
+        self.root.destroy()
         
     def restore_defaults(self):
         """Restore default settings"""
@@ -419,10 +746,11 @@ class ConfigWindow:
         self.right_arm_var.set(next_text)
         self.left_arm_var.set(previous_text)
         self.sensitivity_var.set(0.05)
-        self.cooldown_var.set(1.0)
+        self.cooldown_var.set(0.0)
         self.debug_var.set(True)
         self.keys_var.set(True)
         self.mirror_var.set(True)
+        self.headless_var.set(False)
         
     def save_configuration(self):
         """Save settings without starting the program"""
@@ -452,7 +780,8 @@ class ConfigWindow:
             "show_debug": self.debug_var.get(),
             "powerpoint_keys": self.keys_var.get(),
             "language": self.current_language,
-            "mirror_camera": self.mirror_var.get()
+            "mirror_camera": self.mirror_var.get(),
+            "headless": self.headless_var.get()
         })
         self.config.save_config()
         return True
@@ -462,130 +791,3017 @@ class ConfigWindow:
         if not self._save_current_settings():
             return
             
+        # Hand the camera opened by the preview to the detection instead of reopening it
+        if self.preview is not None:
+            self.preview.request_stop()
+            self.start_button.configure(state="disabled")
+            self.test_button.configure(state="disabled")
+            self.root.after(20, self.hand_over_camera, time.monotonic() + 2.0)
+            return True
+            
         # Close window and start detection
         self.root.destroy()
         return True
+        
+    def hand_over_camera(self, deadline):
+        """Start once the preview thread let go of the camera, polled so the window stays responsive"""
+        if not self.preview.finished() and time.monotonic() < deadline:
+            self.root.after(20, self.hand_over_camera, deadline)
+            return
+        # A preview stuck on the camera closes it later, detection then opens its own
+        self.camera_source = self.preview.detach()
+        self.preview = None
+        self.root.destroy()
 
-class HandySlides:
-    def __init__(self, config):
-        self.config = config.settings
-        self.last_press_time = 0
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-        self.mp_drawing = mp.solutions.drawing_utils
+class FrameBufferRing:
+    """A fixed set of frame buffers that captures are decoded into.
+    
+    A buffer is only decoded into again after release(), so a frame cannot change
+    while anyone still uses it, however long that takes.
+    """
+    def __init__(self, size=3):
+        self.buffers = [None] * size
+        self.free = deque(range(size))
+        self.allocations = 0
+        
+    def read(self, cap):
+        """cap.read() into a free buffer, returns (ret, frame, slot) and the slot must be released.
+        
+        With no buffer free the frame gets a new array of its own and slot is None.
+        """
+        slot = self.free.popleft() if self.free else None
+        buffer = self.buffers[slot] if slot is not None else None
+        ret, frame = cap.read(buffer)
+        if not ret:
+            self.release(slot)
+            return ret, frame, None
+        if frame is not buffer:
+            # First use of this slot, the frame size changed or no slot was free
+            if slot is not None:
+                self.buffers[slot] = frame
+            self.allocations += 1
+        return ret, frame, slot
+        
+    def release(self, slot):
+        """Let the buffer of a slot be decoded into again"""
+        if slot is not None:
+            self.free.append(slot)
+
+class FrameBuffers:
+    """Named destination arrays for OpenCV calls, reused while the shape stays the same"""
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0
+        
+    def get(self, name, shape):
+        """Return the buffer for name, allocating it only when the shape changes"""
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = self.buffers[name] = np.empty(shape, dtype=np.uint8)
+            self.allocations += 1
+        return buffer
+        
+    def swap(self, name, other):
+        """Exchange the buffers of two names"""
+        self.buffers[name], self.buffers[other] = self.buffers.get(other), self.buffers.get(name)
+
+# Left/right landmark index pairs of the MediaPipe pose model
+MIRRORED_LANDMARK_PAIRS = [(1, 4), (2, 5), (3, 6), (7, 8), (9, 10)] + [(i, i + 1) for i in range(11, 33, 2)]
+
+def mirror_landmarks(landmarks):
+    """Reflect landmarks in place as if the frame had been flipped horizontally.
+    
+    x becomes 1 - x and left/right landmarks swap, which is what MediaPipe reports
+    on a mirrored image, without flipping any pixels.
+    """
+    points = landmarks.landmark
+    for landmark in points:
+        landmark.x = 1.0 - landmark.x
+    for left, right in MIRRORED_LANDMARK_PAIRS:
+        a, b = points[left], points[right]
+        a.x, a.y, a.z, a.visibility, b.x, b.y, b.z, b.visibility = \
+            b.x, b.y, b.z, b.visibility, a.x, a.y, a.z, a.visibility
+    return landmarks
+
+# Landmark order after mirroring, left and right swapped
+MIRRORED_LANDMARK_ORDER = list(range(33))
+for left, right in MIRRORED_LANDMARK_PAIRS:
+    MIRRORED_LANDMARK_ORDER[left], MIRRORED_LANDMARK_ORDER[right] = right, left
+
+def mirror_landmark_array(array):
+    """mirror_landmarks for a landmarks_to_array array, returns a new array"""
+    mirrored = array[MIRRORED_LANDMARK_ORDER]
+    mirrored[:, 0] = 1.0 - mirrored[:, 0]
+    return mirrored
+
+class FrameGrabber:
+    """Read frames on a background thread into a one-slot, latest-frame-wins buffer"""
+    def __init__(self, cap, ring_size=3):
+        # One buffer being decoded into, the newest frame and the one the consumer holds
+        self.cap = cap
+        self.ring = FrameBufferRing(ring_size)
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self._frame = None
+        self._slot = None
+        self._held_slot = None
+        self._timestamp = 0.0
+        self._frame_id = 0
+        self._consumed_id = 0
+        self._running = False
+        self._failed = False
+        self._condition = threading.Condition()
+        self._thread = None
+        
+    def start(self):
+        """Start the capture thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="HandySlidesCapture", daemon=True)
+        self._thread.start()
+        return self
+        
+    def _capture_loop(self):
+        """Keep reading so the driver buffer never backs up"""
+        while self._running:
+            ret, frame, slot = self.ring.read(self.cap)
+            timestamp = time.time()
+            with self._condition:
+                if not ret:
+                    self._failed = True
+                    self._condition.notify_all()
+                    break
+                # The previous frame was never picked up by the consumer
+                if self._frame_id > self._consumed_id:
+                    self.frames_dropped += 1
+                    self.ring.release(self._slot)
+                self._frame, self._slot = frame, slot
+                self._timestamp = timestamp
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._condition.notify_all()
+                
+    def read(self):
+        """Wait for a frame newer than the last one returned.
+        
+        Returns (ok, frame, capture_timestamp); ok is False once the stream ended.
+        The frame stays untouched until the next read(), copy it to keep it longer.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frame_id > self._consumed_id or self._failed or not self._running)
+            if self._frame_id <= self._consumed_id:
+                return False, None, 0.0
+            self._consumed_id = self._frame_id
+            # The previously returned frame is done with now
+            self.ring.release(self._held_slot)
+            self._held_slot, self._slot = self._slot, None
+            return True, self._frame, self._timestamp
+            
+    def stop(self):
+        """Stop the capture thread and wake up any waiting reader"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+class PreviewRenderer:
+    """Draw landmarks and show the preview window at a capped rate.
+    
+    run() must be called on the main thread, HighGUI on macOS only works there,
+    so detection runs on a thread of its own and hands frames over with submit().
+    """
+    def __init__(self, handyslides, window_name, max_fps=15):
+        self.handyslides = handyslides
+        self.window_name = window_name
+        self.frame_interval = 1.0 / max(max_fps, 1)
+        self.frames_rendered = 0
+        self.buffers = FrameBuffers()
+        self.stop_requested = threading.Event()
+        self._pending = None
+        self._lock = threading.Lock()
+        self._running = True
+        
+    def submit(self, frame, landmarks, status_text, status_color):
+        """Hand over a copy of the most recent frame, older pending frames are discarded"""
+        with self._lock:
+            # The capture buffer is decoded into again once detection reads the next frame
+            pending = self.buffers.get("pending", frame.shape)
+            np.copyto(pending, frame)
+            self._pending = (pending, landmarks, status_text, status_color)
+            
+    def _is_minimised(self):
+        """Check whether the preview window is currently not visible on screen"""
+        try:
+            _, _, width, height = cv2.getWindowImageRect(self.window_name)
+        except cv2.error:
+            return False
+        return width <= 0 or height <= 0
+        
+    def run(self):
+        """Render at most max_fps frames per second until stop(), the exit key or the window is closed"""
+        # All HighGUI calls stay on this thread
+        cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
+        shown = False
+        next_render = time.perf_counter()
         
+        while self._running:
+            now = time.perf_counter()
+            if now >= next_render:
+                next_render = now + self.frame_interval
+                with self._lock:
+                    pending, self._pending = self._pending, None
+                    if pending is not None:
+                        # submit() copies into the other buffer while this one is drawn on
+                        self.buffers.swap("pending", "drawn")
+                    
+                if pending is not None and not self._is_minimised():
+                    frame, landmarks, status_text, status_color = pending
+                    profiler = self.handyslides.profiler
+                    with profiler.stage("draw"):
+                        # Mirroring only happens here, detection runs on the unflipped frame
+                        if self.handyslides.config["mirror_camera"]:
+                            frame = cv2.flip(frame, 1, dst=self.buffers.get("display", frame.shape))
+                        if landmarks:
+                            self.handyslides.mp_drawing.draw_landmarks(frame, landmarks, 
+                                                                       self.handyslides.mp_pose.POSE_CONNECTIONS)
+                        self.handyslides.add_status_text(frame, status_text, status_color)
+                        if profiler.enabled:
+                            lines = profiler.overlay_lines() + [self.handyslides.governor.describe(), 
+                                                                self.handyslides.motion_gate.describe()]
+                            self.handyslides.add_overlay_lines(frame, lines)
+                    with profiler.stage("imshow"):
+                        cv2.imshow(self.window_name, frame)
+                    self.frames_rendered += 1
+                    shown = True
+                    
+            # Pump window events between renders, this also keeps a minimised window responsive
+            wait_ms = max(1, int((next_render - time.perf_counter()) * 1000))
+            if cv2.waitKey(wait_ms) & 0xFF == ord('q'):
+                self.stop_requested.set()
+                break
+            # Window closed with the title bar button
+            if shown and cv2.getWindowProperty(self.window_name, cv2.WND_PROP_VISIBLE) < 1:
+                self.stop_requested.set()
+                break
+                
+        cv2.destroyWindow(self.window_name)
+        
+    def stop(self):
+        """Make run() return and close the window, can be called from any thread"""
+        self._running = False
+
+class _StageTimer:
+    """Context manager that reports the time spent in a block to a StageProfiler"""
+    __slots__ = ("profiler", "name", "start")
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+class _NullTimer:
+    """Stands in for _StageTimer when profiling is off"""
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class StageProfiler:
+    """Rolling per-stage latency statistics, with an optional Chrome trace of every stage"""
+    def __init__(self, enabled=False, window=120, trace=False, max_trace_events=200000):
+        self.enabled = enabled
+        self.window = window
+        self.durations = {}  # stage name -> recent durations in ms
+        self.frame_times = deque(maxlen=window)
+        self.trace_events = deque(maxlen=max_trace_events) if enabled and trace else None
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        
+    def stage(self, name):
+        """Time a block: `with profiler.stage("inference"): ...`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+        
+    def record(self, name, start, end):
+        """Add one measurement, start and end are time.perf_counter() values"""
+        if not self.enabled:
+            return
+        with self._lock:
+            durations = self.durations.get(name)
+            if durations is None:
+                durations = self.durations[name] = deque(maxlen=self.window)
+            durations.append((end - start) * 1000.0)
+            if self.trace_events is not None:
+                thread = threading.current_thread()
+                self._thread_names.setdefault(thread.ident, thread.name)
+                self.trace_events.append((name, thread.ident, start, end))
+                
+    def tick(self):
+        """Mark the end of a detection frame, used for the fps figure"""
+        if self.enabled:
+            with self._lock:
+                self.frame_times.append(time.perf_counter())
+                
+    def fps(self):
+        """Detection frames per second over the rolling window"""
+        with self._lock:
+            if len(self.frame_times) < 2:
+                return 0.0
+            span = self.frame_times[-1] - self.frame_times[0]
+            return (len(self.frame_times) - 1) / span if span > 0 else 0.0
+            
+    def summary(self):
+        """Return {stage: (p50_ms, p95_ms)} over the rolling window"""
+        with self._lock:
+            snapshot = {name: list(values) for name, values in self.durations.items()}
+        return {name: (percentile(values, 50), percentile(values, 95)) 
+                for name, values in snapshot.items()}
+        
+    def overlay_lines(self):
+        """Short text lines for the preview overlay"""
+        lines = [f"{self.fps():.1f} fps"]
+        for name, (p50, p95) in self.summary().items():
+            lines.append(f"{name}: {p50:.1f} / {p95:.1f} ms")
+        return lines
+        
+    def export(self, path):
+        """Write the trace in Chrome trace format, with the rolling stats alongside"""
+        with self._lock:
+            events = list(self.trace_events or [])
+            thread_names = dict(self._thread_names)
+        pid = os.getpid()
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}} 
+                 for tid, name in thread_names.items()]
+        for name, tid, start, end in events:
+            trace.append({"name": name, "ph": "X", "pid": pid, "tid": tid, 
+                          "ts": round((start - self._origin) * 1e6, 1), 
+                          "dur": round((end - start) * 1e6, 1)})
+        stats = {name: {"p50_ms": round(p50, 3), "p95_ms": round(p95, 3)} 
+                 for name, (p50, p95) in self.summary().items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms", 
+                       "stageStats": stats, "fps": round(self.fps(), 2)}, f)
+
+class RoiPoseProcessor:
+    """Run pose inference on a downscaled crop around the previously detected pose.
+    
+    Landmarks are mapped back to full-frame normalized coordinates, so gesture
+    logic and drawing work exactly as with a full-frame inference.
+    """
+    def __init__(self, pose, working_width=640, roi_tracking=True, roi_padding=0.3, profiler=None):
+        self.pose = pose
+        self.profiler = profiler if profiler is not None else StageProfiler()
+        self.working_width = working_width
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding
+        self.roi = None  # (x0, y0, x1, y1) in pixels, None for the full frame
+        self.buffers = FrameBuffers()
+        
+    def process(self, frame):
+        """Run pose inference on a BGR frame and return the MediaPipe results"""
+        frame_height, frame_width = frame.shape[:2]
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            image = frame[y0:y1, x0:x1]
+        else:
+            x0, y0, x1, y1 = 0, 0, frame_width, frame_height
+            image = frame
+        crop_width, crop_height = x1 - x0, y1 - y0
+        
+        with self.profiler.stage("preprocess"):
+            # Downscale before the color conversion so both run on the small image
+            # Both write into reused buffers, nothing is allocated while the crop size is stable
+            if self.working_width and crop_width > self.working_width:
+                scale = self.working_width / crop_width
+                size = (self.working_width, max(1, round(crop_height * scale)))
+                resized = self.buffers.get("resized", (size[1], size[0], 3))
+                image = cv2.resize(image, size, dst=resized, interpolation=cv2.INTER_AREA)
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, 
+                                     dst=self.buffers.get("rgb", image.shape))
+        with self.profiler.stage("inference"):
+            results = self.pose.process(image_rgb)
+        
+        landmarks = results.pose_landmarks
+        if not landmarks:
+            # Tracking lost, look at the whole frame again
+            self.roi = None
+            return results
+            
+        if self.roi is not None:
+            for landmark in landmarks.landmark:
+                landmark.x = (x0 + landmark.x * crop_width) / frame_width
+                landmark.y = (y0 + landmark.y * crop_height) / frame_height
+                landmark.z = landmark.z * crop_width / frame_width
+                
+        if self.roi_tracking:
+            self.roi = self._track_roi(landmarks, frame_width, frame_height)
+        return results
+        
+    def _track_roi(self, landmarks, frame_width, frame_height):
+        """Compute the crop for the next frame from the current landmarks"""
+        points = [(lm.x, lm.y) for lm in landmarks.landmark if lm.visibility > 0.3]
+        if len(points) < 4:
+            return None
+        xs = [p[0] * frame_width for p in points]
+        ys = [p[1] * frame_height for p in points]
+        left, right, top, bottom = min(xs), max(xs), min(ys), max(ys)
+        
+        # Keep the current crop while the pose stays well inside it, a stable
+        # crop lets MediaPipe's own tracking carry over between frames
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            margin = 0.25 * self.roi_padding * max(right - left, bottom - top)
+            if (left - margin >= x0 and top - margin >= y0 and 
+                    right + margin <= x1 and bottom + margin <= y1):
+                return self.roi
+        
+        padding = self.roi_padding * max(right - left, bottom - top)
+        # Extra headroom above the pose so a raised arm stays inside the crop
+        x0 = max(0, int(left - padding))
+        y0 = max(0, int(top - 2 * padding))
+        x1 = min(frame_width, int(right + padding))
+        y1 = min(frame_height, int(bottom + padding))
+        
+        # Not worth cropping when the pose fills most of the frame
+        if (x1 - x0) * (y1 - y0) > 0.8 * frame_width * frame_height:
+            return None
+        return x0, y0, x1, y1
+
+def apply_capture_mode(cap, fourcc, width, height, fps):
+    """Request a capture mode, the FOURCC goes first as some drivers reset the size on change"""
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    # Keep the driver queue short, the grabber thread drains it anyway
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+def open_camera(index, profile=None):
+    """Open a camera in its cached capture mode, or with driver defaults without one"""
+    if profile:
+        backend = getattr(cv2, "CAP_" + profile.get("backend", "ANY"), cv2.CAP_ANY)
+        cap = cv2.VideoCapture(index, backend)
+        if cap.isOpened():
+            apply_capture_mode(cap, profile["fourcc"], profile["width"], profile["height"], profile["fps"])
+            return cap
+        cap.release()
+    cap = cv2.VideoCapture(index)
+    if cap.isOpened():
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+class CameraProber:
+    """Measure which backend, FOURCC and resolution deliver frames fastest with the least buffering"""
+    RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+    FOURCCS = ["MJPG", "YUYV"]
+    REQUESTED_FPS = 60
+    
+    def __init__(self, measure_time=1.0, measure_frames=30, max_devices=4):
+        # Slow modes (e.g. YUYV 1080p at 5 fps) are timed for measure_time, not measure_frames
+        self.measure_time = measure_time
+        self.measure_frames = measure_frames
+        self.max_devices = max_devices
+        
+    def backends(self):
+        """Capture backends worth trying on this platform"""
+        if sys.platform.startswith("win"):
+            return ["MSMF", "DSHOW"]
+        if sys.platform == "darwin":
+            return ["AVFOUNDATION"]
+        return ["V4L2"]
+        
+    def list_devices(self):
+        """Indexes of the cameras that can be opened"""
+        devices = []
+        for index in range(self.max_devices):
+            cap = cv2.VideoCapture(index)
+            if cap.isOpened():
+                devices.append(index)
+            cap.release()
+        return devices
+        
+    def probe(self, index, progress=None):
+        """Try every capture mode of a camera, returns (best_profile, all_measured_profiles)"""
+        results = []
+        for backend in self.backends():
+            for fourcc in self.FOURCCS:
+                for width, height in self.RESOLUTIONS:
+                    if progress is not None:
+                        progress(f"{backend} {fourcc} {width}x{height}")
+                    profile = self._measure(index, backend, fourcc, width, height)
+                    if profile is not None:
+                        results.append(profile)
+        if not results:
+            return None, results
+        return max(results, key=self._score), results
+        
+    def _score(self, profile):
+        """Higher is better: frame rate first, then shallow buffers, then a small frame"""
+        return (min(profile["measured_fps"], 60) - 10 * profile["buffer_depth"] 
+                - profile["width"] * profile["height"] / 1e6)
+        
+    def _measure(self, index, backend, fourcc, width, height):
+        """Open one mode and measure delivered frame rate and buffer depth"""
+        backend_id = getattr(cv2, "CAP_" + backend, None)
+        if backend_id is None:
+            return None
+        cap = cv2.VideoCapture(index, backend_id)
+        try:
+            if not cap.isOpened():
+                return None
+            apply_capture_mode(cap, fourcc, width, height, self.REQUESTED_FPS)
+            # The driver may pick something else, keep what it actually delivers
+            actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            code = int(cap.get(cv2.CAP_PROP_FOURCC))
+            actual_fourcc = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00") or fourcc
+            if (actual_width, actual_height) != (width, height):
+                return None  # Not a mode of this camera
+                
+            # Let exposure and the stream settle before timing
+            settle_until = time.perf_counter() + 0.25 * self.measure_time
+            for _ in range(5):
+                if not cap.read()[0]:
+                    return None
+                if time.perf_counter() > settle_until:
+                    break
+            start = time.perf_counter()
+            frames, elapsed = 0, 0.0
+            while frames < self.measure_frames and elapsed < self.measure_time:
+                if not cap.read()[0]:
+                    return None
+                frames += 1
+                elapsed = time.perf_counter() - start
+            measured_fps = frames / elapsed
+            
+            # Stop reading for a while, then count how many queued frames come back instantly
+            time.sleep(0.3 * self.measure_time)
+            buffer_depth = 0
+            fast_read = 0.25 / measured_fps
+            for _ in range(10):
+                read_start = time.perf_counter()
+                if not cap.read()[0] or time.perf_counter() - read_start > fast_read:
+                    break
+                buffer_depth += 1
+                
+            return {"backend": backend, "fourcc": actual_fourcc, "width": width, "height": height, 
+                    "fps": self.REQUESTED_FPS, "measured_fps": round(measured_fps, 1), 
+                    "buffer_depth": buffer_depth}
+        finally:
+            cap.release()
+
+def describe_camera_profile(profile):
+    """One line summary of a capture profile"""
+    return (f"{profile['width']}x{profile['height']} {profile['fourcc']} via {profile['backend']}, "
+            f"{profile['measured_fps']} fps, {profile['buffer_depth']} buffered frames")
+
+class CameraSource:
+    """Live camera frames, read through a FrameGrabber so only the newest frame is used"""
+    def __init__(self, index=0, profile=None):
+        self.index = index
+        self.profile = profile
+        self.cap = None
+        self.grabber = None
+        
+    def open(self):
+        """Open the camera and start capturing, returns False if it is not available"""
+        if self.is_open():
+            return True  # Already streaming, e.g. handed over by the settings window
+        self.cap = open_camera(self.index, self.profile)
+        if not self.cap.isOpened():
+            return False
+        self.grabber = FrameGrabber(self.cap).start()
+        return True
+        
+    def is_open(self):
+        """True while capturing"""
+        return self.grabber is not None
+        
+    def read(self):
+        """Return (ok, frame, capture_timestamp) for the newest frame, valid until the next read()"""
+        return self.grabber.read()
+        
+    def release(self):
+        """Stop capturing and close the camera"""
+        if self.grabber is not None:
+            self.grabber.stop()
+            self.grabber = None
+        if self.cap is not None:
+            self.cap.release()
+            
+    def stats(self):
+        """Capture counters for the debug output"""
+        if self.grabber is None:
+            return {}
+        return {"captured": self.grabber.frames_captured, "dropped": self.grabber.frames_dropped, 
+                "buffer allocations": self.grabber.ring.allocations}
+
+class VideoFileSource:
+    """Every frame of a recorded video, timestamped with its position in the video"""
+    def __init__(self, path):
+        self.path = path
+        self.cap = None
+        self.ring = FrameBufferRing(2)
+        self._slot = None
+        self.frames_read = 0
+        
+    def open(self):
+        """Open the video file, returns False if it cannot be decoded"""
+        self.cap = cv2.VideoCapture(self.path)
+        return self.cap.isOpened()
+        
+    def read(self):
+        """Return (ok, frame, video_timestamp) for the next frame, valid until the next read()"""
+        self.ring.release(self._slot)
+        ret, frame, self._slot = self.ring.read(self.cap)
+        if not ret:
+            return False, None, 0.0
+        self.frames_read += 1
+        return True, frame, self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        
+    def release(self):
+        """Close the video file"""
+        if self.cap is not None:
+            self.cap.release()
+            
+    def stats(self):
+        """Read counters for the debug output"""
+        return {"read": self.frames_read, "buffer allocations": self.ring.allocations}
+
+class ImageDirectorySource:
+    """Images of a directory in name order, played back at a fixed frame rate"""
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+    
+    def __init__(self, path, fps=30.0):
+        self.path = path
+        self.fps = fps
+        self.files = []
+        self.frames_read = 0
+        
+    def open(self):
+        """List the images, returns False if the directory has none"""
+        self.files = sorted(f for f in glob.glob(os.path.join(self.path, "*")) 
+                            if f.lower().endswith(self.IMAGE_EXTENSIONS))
+        self.frames_read = 0
+        return len(self.files) > 0
+        
+    def read(self):
+        """Return (ok, frame, timestamp) for the next image"""
+        while self.frames_read < len(self.files):
+            frame = cv2.imread(self.files[self.frames_read])
+            timestamp = self.frames_read / self.fps
+            self.frames_read += 1
+            if frame is not None:
+                return True, frame, timestamp
+        return False, None, 0.0
+        
+    def release(self):
+        """Nothing to close for image files"""
+        pass
+        
+    def stats(self):
+        """Read counters for the debug output"""
+        return {"read": self.frames_read}
+
+def open_frame_source(spec):
+    """Create a frame source from a camera index, a video file or an image directory"""
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec)
+    return VideoFileSource(spec)
+
+class PyAutoGuiKeySink:
+    """Send key presses to the focused application"""
+    def __init__(self):
         # Configure pyautogui
         pyautogui.FAILSAFE = True
         pyautogui.PAUSE = 0.1
         
-    def is_arm_raised(self, landmarks):
-        """Detect if any arm is raised"""
-        if not landmarks:
-            return None
+    def press(self, key, timestamp=None, presses=1):
+        pyautogui.press(key, presses=presses)
+
+class NullKeySink:
+    """Discard key presses, for benchmarks and headless tests"""
+    def press(self, key, timestamp=None, presses=1):
+        pass
+
+class RecordingKeySink:
+    """Keep key presses in memory instead of sending them"""
+    def __init__(self):
+        self.events = []  # (timestamp, key)
+        
+    def press(self, key, timestamp=None, presses=1):
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.events.extend([(timestamp, key)] * presses)
+
+class SocketKeySink:
+    """Send key presses as JSON datagrams to a local UDP port, for tests and other tools"""
+    def __init__(self, port, host="127.0.0.1"):
+        self.address = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+    def press(self, key, timestamp=None, presses=1):
+        message = {"key": key, "presses": presses, "timestamp": timestamp}
+        self.sock.sendto(json.dumps(message).encode("utf-8"), self.address)
+
+def create_key_sink(spec):
+    """Key sink for the key_output setting: "pyautogui", "null" or "socket:PORT" """
+    if spec == "null":
+        return NullKeySink()
+    if spec.startswith("socket:"):
+        return SocketKeySink(int(spec.split(":", 1)[1]))
+    return PyAutoGuiKeySink()
+
+class KeyDispatcher:
+    """Send key presses from a dedicated thread so the detection loop never waits for injection.
+    
+    Presses of the same key that queue up while an injection is in progress are
+    coalesced into one call that presses the key several times.
+    """
+    def __init__(self, key_sink, max_queue=16):
+        self.key_sink = key_sink
+        self.events_sent = 0
+        self.events_coalesced = 0
+        self.events_dropped = 0
+        self.events_failed = 0
+        self.latencies = deque(maxlen=256)  # Capture to injection, in ms
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        
+    def start(self):
+        """Start the dispatcher thread"""
+        self._thread = threading.Thread(target=self._dispatch_loop, name="HandySlidesKeys", daemon=True)
+        self._thread.start()
+        return self
+        
+    def press(self, key, timestamp=None, presses=1):
+        """Queue a key press and return immediately; timestamp is the capture time of its frame"""
+        try:
+            self._queue.put_nowait((key, timestamp if timestamp is not None else time.time(), presses))
+        except queue.Full:
+            self.events_dropped += 1
             
-        left_shoulder = landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        left_wrist = landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_WRIST]
-        right_wrist = landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_WRIST]
+    def _dispatch_loop(self):
+        """Inject queued presses, merging runs of the same key"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # Stop after this batch
+                    break
+                batch.append(item)
+                
+            start = 0
+            while start < len(batch):
+                key, timestamp, presses = batch[start]
+                end = start + 1
+                while end < len(batch) and batch[end][0] == key:
+                    presses += batch[end][2]
+                    end += 1
+                self.events_coalesced += end - start - 1
+                try:
+                    self.key_sink.press(key, timestamp, presses)
+                except Exception as e:
+                    # E.g. pyautogui's fail-safe or a closed socket, keep serving later presses
+                    print(f"Error sending key {key}: {e}")
+                    self.events_failed += end - start
+                    start = end
+                    continue
+                injected = time.time()
+                for _, event_time, _ in batch[start:end]:
+                    self.latencies.append((injected - event_time) * 1000.0)
+                self.events_sent += end - start
+                start = end
+                
+    def close(self):
+        """Send what is still queued and stop the thread"""
+        if self._thread is not None:
+            if self._thread.is_alive():
+                try:
+                    self._queue.put(None, timeout=5.0)
+                except queue.Full:
+                    pass  # Stuck in a sink call, the join below gives up too
+                self._thread.join(timeout=5.0)
+            self._thread = None
 
-        if self.config["show_debug"]:
-            print(f"L.Shoulder.y: {left_shoulder.y:.3f}, L.Wrist.y: {left_wrist.y:.3f}")
-            print(f"R.Shoulder.y: {right_shoulder.y:.3f}, R.Wrist.y: {right_wrist.y:.3f}")
+class EventSubscriber:
+    """One connected client of the EventBus, written to by its own thread"""
+    def __init__(self, conn, queue_size):
+        self.conn = conn
+        self.queue_size = queue_size
+        self.closed = False
+        self._lines = deque()
+        self._ready = threading.Condition()
+        self._closing = False
+        self._thread = None
+        
+    def start(self):
+        """Start sending queued events"""
+        self._thread = threading.Thread(target=self._send_loop, name="HandySlidesEventSubscriber", daemon=True)
+        self._thread.start()
+        return self
+        
+    def offer(self, line):
+        """Queue an encoded event without waiting, returns False if an older event was dropped for it"""
+        with self._ready:
+            dropped = len(self._lines) >= self.queue_size
+            if dropped:
+                self._lines.popleft()  # A slow client gets the newest events
+            self._lines.append(line)
+            self._ready.notify()
+        return not dropped
+        
+    def _send_loop(self):
+        try:
+            while True:
+                with self._ready:
+                    while not self._lines and not self._closing:
+                        self._ready.wait()
+                    if not self._lines:
+                        break
+                    data = b"".join(self._lines)
+                    self._lines.clear()
+                self.conn.sendall(data)
+        except OSError:
+            pass  # Client went away
+        finally:
+            self.closed = True
+            self.conn.close()
+            
+    def close(self, timeout=1.0):
+        """Send what is still queued, then disconnect"""
+        with self._ready:
+            self._closing = True
+            self._ready.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                # Stuck on a client that stopped reading
+                try:
+                    self.conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                self._thread.join(timeout=timeout)
+
+class EventBus:
+    """Broadcast gesture events as JSON lines to every client of a local socket.
+    
+    address is "tcp:PORT" (localhost only) or "unix:PATH". publish() never waits
+    for clients: every subscriber has a bounded queue and a sender thread, a
+    full queue drops its oldest event.
+    """
+    def __init__(self, address, queue_size=256, accept_interval=0.5):
+        self.address = address
+        self.queue_size = queue_size
+        self.accept_interval = accept_interval
+        self.events_published = 0
+        self.events_dropped = 0
+        self.subscribers = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._running = False
+        self._thread = None
+        
+    def start(self):
+        """Listen for subscribers, raises OSError or ValueError for an unusable address"""
+        kind, _, target = self.address.partition(":")
+        if kind == "unix":
+            if not hasattr(socket, "AF_UNIX"):
+                raise ValueError("unix sockets are not available here, use tcp:PORT")
+            if os.path.exists(target):
+                if not stat.S_ISSOCK(os.stat(target).st_mode):
+                    raise ValueError(f"{target} exists and is not a socket")
+                os.unlink(target)  # Left over from a previous run
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(target)
+        elif kind == "tcp":
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(("127.0.0.1", int(target)))
+        else:
+            raise ValueError(f"event_bus must be tcp:PORT or unix:PATH, not {self.address!r}")
+        server.listen()
+        server.settimeout(self.accept_interval)
+        self._server = server
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name="HandySlidesEventBus", daemon=True)
+        self._thread.start()
+        return self
+        
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            subscriber = EventSubscriber(conn, self.queue_size).start()
+            with self._lock:
+                self.subscribers.append(subscriber)
+                
+    def publish(self, kind, timestamp=None, **fields):
+        """Send an event of type kind to all subscribers; timestamp is the capture time of its frame"""
+        event = {"type": kind, "time": timestamp if timestamp is not None else time.time()}
+        event.update(fields)
+        line = (json.dumps(event) + "\n").encode("utf-8")
+        with self._lock:
+            self.events_published += 1
+            if any(subscriber.closed for subscriber in self.subscribers):
+                self.subscribers = [subscriber for subscriber in self.subscribers if not subscriber.closed]
+            for subscriber in self.subscribers:
+                if not subscriber.offer(line):
+                    self.events_dropped += 1
+                    
+    def stats(self):
+        """Counters for the summary output"""
+        with self._lock:
+            subscribers = sum(not subscriber.closed for subscriber in self.subscribers)
+        return {"published": self.events_published, "dropped": self.events_dropped, "subscribers": subscribers}
+        
+    def close(self):
+        """Stop listening and disconnect all subscribers after sending their queued events"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            kind, _, target = self.address.partition(":")
+            if kind == "unix" and os.path.exists(target) and stat.S_ISSOCK(os.stat(target).st_mode):
+                os.unlink(target)
+        with self._lock:
+            subscribers, self.subscribers = self.subscribers, []
+        for subscriber in subscribers:
+            subscriber.close()
+
+def create_event_bus(settings):
+    """Started EventBus for the event_bus setting, None if it is off or cannot listen"""
+    address = settings.get("event_bus", "")
+    if not address:
+        return None
+    try:
+        return EventBus(address, settings.get("event_queue_size", 256)).start()
+    except (OSError, ValueError) as e:
+        print(f"Error: event bus not started: {e}")
+        return None
 
-        sensitivity = self.config["sensitivity"]
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers, 0.0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+class GestureStateMachine:
+    """Edge-triggered raise detection for one arm: down -> rising -> raised -> lowered -> down.
+    
+    Fires exactly once per raise, a held arm does not repeat.
+    """
+    DOWN = "down"
+    RISING = "rising"
+    RAISED = "raised"
+    LOWERED = "lowered"
+    
+    def __init__(self, confirm_frames=2):
+        self.confirm_frames = max(1, confirm_frames)
+        self.state = self.DOWN
+        self.count = 0
+        
+    def update(self, above_raise, below_release):
+        """Feed one frame, returns True on the frame that confirms a raise.
+        
+        above_raise: the arm is above the raise threshold
+        below_release: the arm is below the (lower) release threshold
+        """
+        if self.state in (self.DOWN, self.RISING):
+            if not above_raise:
+                self.state, self.count = self.DOWN, 0
+                return False
+            self.count = self.count + 1 if self.state == self.RISING else 1
+            self.state = self.RISING
+            if self.count >= self.confirm_frames:
+                self.state, self.count = self.RAISED, 0
+                return True
+        elif self.state == self.RAISED:
+            if below_release:
+                self.state, self.count = self.LOWERED, 0
+                self._lower()
+        elif self.state == self.LOWERED:
+            if below_release:
+                self._lower()
+            elif above_raise:
+                # Arm went back up before the release was confirmed
+                self.state, self.count = self.RAISED, 0
+        return False
+        
+    def _lower(self):
+        """Count one frame below the release threshold"""
+        self.count += 1
+        if self.count >= self.confirm_frames:
+            self.state, self.count = self.DOWN, 0
+            
+    def defer(self):
+        """Undo a raise that could not be acted on, it fires again on the next raised frame"""
+        self.state, self.count = self.RISING, self.confirm_frames - 1
+        
+    def consume(self):
+        """Treat the gesture as already fired, it has to be released before it can fire"""
+        self.state, self.count = self.RAISED, 0
+        
+    def reset(self):
+        """Forget the current gesture"""
+        self.state, self.count = self.DOWN, 0
+
+# Indexes of the MediaPipe pose landmarks used by gesture rules
+LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_WRIST, RIGHT_WRIST = 11, 12, 15, 16
+ARMS = ("Left", "Right")
+SHOULDERS = [LEFT_SHOULDER, RIGHT_SHOULDER]
+WRISTS = [LEFT_WRIST, RIGHT_WRIST]
+
+# Keys for each action: (arrow keys, Page Up/Down keys)
+ACTION_KEYS = {
+    "next": ("right", "pagedown"),
+    "previous": ("left", "pageup"),
+    "first": ("home", "home"),
+    "last": ("end", "end"),
+    "blank": ("b", "b")
+}
+
+class LandmarkWindow:
+    """The landmarks of the last frames in one (size, 33, 4) ring buffer"""
+    def __init__(self, size=32, landmark_count=33):
+        self.landmarks = np.zeros((size, landmark_count, 4), dtype=np.float32)
+        self.times = np.zeros(size)
+        self.present = np.zeros(size, dtype=bool)
+        self.index = -1  # Slot of the newest frame
+        
+    def push(self, timestamp, array=None):
+        """Store a frame's landmark array, None when no pose was found, returns its (33, 4) slot"""
+        self.index = (self.index + 1) % len(self.times)
+        slot = self.landmarks[self.index]
+        self.times[self.index] = timestamp
+        self.present[self.index] = array is not None
+        if array is not None:
+            slot[:] = array
+        return slot
         
-        if left_wrist.y < left_shoulder.y - sensitivity:
-            return "Left"
+    def wrist_velocity(self, span):
+        """Horizontal speed of both wrists over the last span seconds, in image widths per second"""
+        recent = self.present & (self.times >= self.times[self.index] - span)
+        if np.count_nonzero(recent) < 2:
+            return np.zeros(2)
+        # Least squares slope of x over time, both wrists at once
+        times = self.times[recent]
+        x = self.landmarks[recent][:, WRISTS, 0]
+        dt = times - times.mean()
+        denominator = np.dot(dt, dt)
+        if denominator == 0:
+            return np.zeros(2)
+        return dt @ (x - x.mean(axis=0)) / denominator
 
-        if right_wrist.y < right_shoulder.y - sensitivity:
-            return "Right"
+def wrist_velocities(times, landmarks, present, span, window_size, chunk=16384):
+    """LandmarkWindow.wrist_velocity for every frame of a recording, shaped (frames, 2)"""
+    velocities = np.zeros((len(times), 2))
+    pad = window_size - 1
+    for first in range(0, len(times), chunk):
+        # Each frame sees the window_size frames up to it, like the live ring buffer
+        begin, end = max(first - pad, 0), min(first + chunk, len(times))
+        missing = pad - (first - begin)
+        t = np.concatenate([np.zeros(missing), times[begin:end]])
+        ok = np.concatenate([np.zeros(missing, dtype=bool), present[begin:end]])
+        x = np.concatenate([np.zeros((missing, 2)), landmarks[begin:end][:, WRISTS, 0]])
+        t_window = np.lib.stride_tricks.sliding_window_view(t, window_size)
+        x_window = np.lib.stride_tricks.sliding_window_view(x, window_size, axis=0)
+        ok_window = np.lib.stride_tricks.sliding_window_view(ok, window_size) & \
+                    (t_window >= times[first:end, None] - span)
+        count = ok_window.sum(axis=1)
+        safe_count = np.maximum(count, 1)
+        mean_t = (t_window * ok_window).sum(axis=1) / safe_count
+        dt = (t_window - mean_t[:, None]) * ok_window
+        denominator = (dt * dt).sum(axis=1)
+        mean_x = (x_window * ok_window[:, None, :]).sum(axis=2) / safe_count[:, None]
+        numerator = (dt[:, None, :] * (x_window - mean_x[:, :, None])).sum(axis=2)
+        valid = (count >= 2) & (denominator > 0)
+        velocities[first:end] = np.where(valid[:, None], numerator / np.where(valid, denominator, 1.0)[:, None], 0.0)
+    return velocities
 
+class LandmarkFilter:
+    """One Euro filter on the x and y of every landmark, with a velocity estimate.
+    
+    Still landmarks are smoothed strongly to remove jitter; the cutoff frequency
+    rises with the speed, so moving landmarks follow with little lag.
+    """
+    def __init__(self, min_cutoff=1.5, beta=5.0, derivative_cutoff=1.0, landmark_count=33):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        self.position = np.zeros((landmark_count, 2))
+        self.velocity = np.zeros((landmark_count, 2))  # Normalized image units per second
+        self.filtered = np.zeros((landmark_count, 4), dtype=np.float32)
+        self._last_time = None
+        
+    def reset(self):
+        """Start over, e.g. after the pose was lost"""
+        self._last_time = None
+        
+    def filter(self, array, timestamp):
+        """Smooth a (33, 4) landmark array, returns the filtered array and the (33, 2) velocities"""
+        xy = array[:, :2]
+        if self._last_time is None:
+            self.position[:] = xy
+            self.velocity[:] = 0.0
+            self._last_time = timestamp
+        elif timestamp > self._last_time:
+            dt = timestamp - self._last_time
+            raw_velocity = (xy - self.position) / dt
+            self.velocity += (raw_velocity - self.velocity) / (1.0 + 1.0 / (2 * math.pi * self.derivative_cutoff * dt))
+            cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+            self.position += (xy - self.position) / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+            self._last_time = timestamp
+        self.filtered[:] = array
+        self.filtered[:, :2] = self.position
+        return self.filtered, self.velocity
+        
+    def filter_batch(self, times, landmarks, present, channels=None):
+        """Filter a whole recording, returns the filtered landmarks and velocities of every frame.
+        
+        Only channels, (landmark, axis) pairs, are filtered: by default the shoulder
+        heights and wrist positions the gesture rules read, the rest is passed
+        through. The steps of filter() run on plain floats, numpy calls on a few
+        values per frame would cost more than the arithmetic.
+        """
+        if channels is None:
+            channels = [(shoulder, 1) for shoulder in SHOULDERS] + [(wrist, axis) for wrist in WRISTS for axis in (0, 1)]
+        count, width = len(times), len(channels)
+        landmark_index, axis_index = [list(column) for column in zip(*channels)]
+        filtered = np.array(landmarks, dtype=np.float32)
+        velocities = np.zeros(landmarks.shape[:2] + (2,))
+        positions = filtered[:, landmark_index, axis_index].astype(np.float64)
+        rates = np.zeros((count, width))
+        raw = positions.tolist()
+        min_cutoff, beta, derivative_cutoff = self.min_cutoff, self.beta, self.derivative_cutoff
+        columns = range(width)
+        position = velocity = last_time = None
+        for i, (timestamp, found) in enumerate(zip(times.tolist(), present.tolist())):
+            if not found:
+                last_time = None
+                continue
+            xy = raw[i]
+            if last_time is None:
+                position, velocity, last_time = list(xy), [0.0] * width, timestamp
+            elif timestamp > last_time:
+                dt = timestamp - last_time
+                derivative_alpha = 1.0 + 1.0 / (2 * math.pi * derivative_cutoff * dt)
+                for c in columns:
+                    velocity[c] += ((xy[c] - position[c]) / dt - velocity[c]) / derivative_alpha
+                    cutoff = min_cutoff + beta * abs(velocity[c])
+                    position[c] += (xy[c] - position[c]) / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+                last_time = timestamp
+            positions[i] = position
+            rates[i] = velocity
+        filtered[:, landmark_index, axis_index] = positions
+        velocities[:, landmark_index, axis_index] = rates
+        return filtered, velocities
+
+class GestureRule:
+    """A gesture: which arms are raised or down, how long it is held or how fast a wrist swipes.
+    
+    It sends the key of action, or key when given.
+    """
+    def __init__(self, name, raised=(), lowered=(), hold=0.0, swipe=None, action=None, key=None):
+        for arm in tuple(raised) + tuple(lowered) + ((swipe[0],) if swipe else ()):
+            if arm not in ARMS:
+                raise ValueError(f"unknown arm {arm!r} in gesture {name!r}")
+        if action is None and key is None:
+            raise ValueError(f"gesture {name!r} needs an action or a key")
+        if action is not None and action not in ACTION_KEYS:
+            raise ValueError(f"unknown action {action!r} in gesture {name!r}")
+        if not raised and not swipe:
+            raise ValueError(f"gesture {name!r} needs a raised arm or a swipe")
+        self.name = name
+        self.raised = tuple(raised)
+        self.lowered = tuple(lowered)
+        self.hold = float(hold)
+        self.swipe = (swipe[0], float(swipe[1])) if swipe else None  # (arm, signed speed)
+        self.action = action
+        self.key = key
+        
+    @classmethod
+    def from_dict(cls, spec):
+        """Rule from its gesture_rules entry"""
+        return cls(spec.get("name", "Gesture"), spec.get("raised", ()), spec.get("lowered", ()), 
+                   spec.get("hold", 0.0), spec.get("swipe"), spec.get("action"), spec.get("key"))
+        
+    def arms(self):
+        """Arms the rule looks at"""
+        return set(self.raised) | set(self.lowered) | ({self.swipe[0]} if self.swipe else set())
+
+def create_gesture_rules(settings):
+    """Rules from gesture_rules, or one rule per arm for the configured arm actions"""
+    # Each arm fires whatever the other arm does, e.g. while it holds a microphone
+    specs = settings.get("gesture_rules") or [
+        {"name": "Left arm", "raised": ["Left"], "action": settings["left_arm_action"]},
+        {"name": "Right arm", "raised": ["Right"], "action": settings["right_arm_action"]}
+    ]
+    return [GestureRule.from_dict(spec) for spec in specs]
+
+class GestureRuleEngine:
+    """Evaluate all gesture rules at once with array operations on a LandmarkWindow.
+    
+    Every rule feeds a GestureStateMachine, so each gesture fires once per
+    occurrence. Rules with more arms are checked first. When a rule fires, the
+    rules sharing its arms wait until those arms are released, except rules
+    held longer, so holding a gesture can escalate to another one.
+    """
+    def __init__(self, rules, window_size=32, confirm_frames=2, swipe_span=0.3, prediction_time=0.0, 
+                 prediction_min_speed=0.4):
+        self.rules = sorted(rules, key=lambda rule: -len(rule.arms()))
+        self.window = LandmarkWindow(window_size)
+        self.machines = [GestureStateMachine(confirm_frames) for _ in self.rules]
+        self.swipe_span = swipe_span
+        self.prediction_time = prediction_time
+        self.prediction_min_speed = prediction_min_speed  # Image heights per second
+        self.need_raised = np.array([[arm in rule.raised for arm in ARMS] for rule in self.rules], 
+                                    dtype=bool).reshape(-1, 2)
+        self.need_lowered = np.array([[arm in rule.lowered for arm in ARMS] for rule in self.rules], 
+                                     dtype=bool).reshape(-1, 2)
+        self.uses_arm = np.array([[arm in rule.arms() for arm in ARMS] for rule in self.rules], 
+                                 dtype=bool).reshape(-1, 2)
+        self.hold = np.array([rule.hold for rule in self.rules])
+        self.swipe_arm = np.array([ARMS.index(rule.swipe[0]) if rule.swipe else 0 for rule in self.rules])
+        self.swipe_speed = np.array([rule.swipe[1] if rule.swipe else 0.0 for rule in self.rules])
+        self.has_raised = self.need_raised.any(axis=1)
+        self.active = np.zeros(len(self.rules), dtype=bool)
+        self.since = np.full(len(self.rules), np.inf)  # When each rule became active, inf while inactive
+        self.elevations = np.zeros(2)  # Wrist above shoulder of the newest frame, per arm
+        
+    def skip(self, timestamp):
+        """Record a frame without a pose, it interrupts holds and swipes"""
+        self.window.push(timestamp)
+        self.active[:] = False
+        self.since[:] = np.inf
+        
+    def _predict(self, elevations, velocity):
+        """Elevations extrapolated prediction_time ahead while arms move up, velocity shaped (..., 33, 2)"""
+        if velocity is None or not self.prediction_time:
+            return elevations
+        rising = velocity[..., SHOULDERS, 1] - velocity[..., WRISTS, 1]
+        # Only a clear upward motion counts, slower drift is left to the position
+        return elevations + np.where(rising > self.prediction_min_speed, rising, 0.0) * self.prediction_time
+        
+    def _match(self, elevations, raise_threshold, release_threshold, predicted=None):
+        """Active rules and rules whose raised arms came down, for elevations shaped (..., 2).
+        
+        predicted: elevations to test against the raise threshold, defaults to elevations
+        """
+        raised = ((predicted if predicted is not None else elevations) > raise_threshold)[..., None, :]
+        released = (elevations < release_threshold)[..., None, :]
+        active = np.all(raised | ~self.need_raised, axis=-1) & np.all(~raised | ~self.need_lowered, axis=-1)
+        return active, np.any(released & self.need_raised, axis=-1)
+        
+    def _swiping(self, velocity):
+        """Rules whose swipe condition holds, for wrist velocities shaped (..., 2)"""
+        velocity = velocity[..., self.swipe_arm]
+        # Same direction as the rule's speed and at least as fast
+        return (self.swipe_speed == 0) | (velocity * self.swipe_speed >= self.swipe_speed ** 2)
+        
+    def evaluate(self, timestamp, raise_threshold, release_threshold, array, velocity=None):
+        """Feed one pose, returns the rule confirmed on this frame or None.
+        
+        velocity: (33, 2) landmark velocities, lets a fast raise trigger before crossing the threshold
+        """
+        points = self.window.push(timestamp, array)
+        self.elevations = points[SHOULDERS, 1] - points[WRISTS, 1]
+        active, arm_released = self._match(self.elevations, raise_threshold, release_threshold, 
+                                           self._predict(self.elevations, velocity))
+        if self.swipe_speed.any():
+            active &= self._swiping(self.window.wrist_velocity(self.swipe_span))
+        self.since = np.where(active, np.minimum(self.since, timestamp), np.inf)
+        triggered = active & (timestamp - self.since >= self.hold)
+        # A gesture ends when one of its raised arms comes down, a swipe when it stops
+        ended = np.where(self.has_raised, arm_released, ~active)
+        return self.step(active, triggered.tolist(), ended.tolist())
+        
+    def evaluate_batch(self, times, landmarks, present, raise_threshold, release_threshold, velocities=None):
+        """Rule conditions for every frame of a recording at once, to be fed to step().
+        
+        Returns active, triggered and ended arrays of shape (frames, rules).
+        Frames without a pose interrupt holds and swipes like skip() does.
+        """
+        elevations = landmarks[:, SHOULDERS, 1] - landmarks[:, WRISTS, 1]
+        active, arm_released = self._match(elevations, raise_threshold, release_threshold, 
+                                           self._predict(elevations, velocities))
+        active &= present[:, None]
+        if self.swipe_speed.any():
+            active &= self._swiping(wrist_velocities(times, landmarks, present, self.swipe_span, 
+                                                     len(self.window.times)))
+        # First frame of each rule's current run of active frames
+        frames = np.arange(len(times))[:, None]
+        run_start = np.maximum.accumulate(np.where(active, -1, frames), axis=0) + 1
+        held_for = times[:, None] - times[np.minimum(run_start, len(times) - 1)]
+        triggered = active & (held_for >= self.hold)
+        ended = np.where(self.has_raised, arm_released, ~active)
+        return active, triggered, ended
+        
+    def step(self, active, triggered, ended):
+        """Advance the state machines by one frame of rule conditions, returns the confirmed rule or None"""
+        self.active = active
+        fired = None
+        for i, machine in enumerate(self.machines):
+            if machine.update(triggered[i], ended[i]):
+                if fired is None:
+                    fired = i
+                else:
+                    machine.defer()
+        if fired is None:
+            return None
+        shares_arms = np.any(self.uses_arm & self.uses_arm[fired], axis=1)
+        for i in np.flatnonzero(shares_arms & (self.hold <= self.hold[fired])):
+            if i != fired:
+                self.machines[i].consume()
+        return self.rules[fired]
+        
+    def states(self):
+        """State of every rule's machine, by rule name"""
+        return {rule.name: machine.state for rule, machine in zip(self.rules, self.machines)}
+        
+    def at_rest(self, release_threshold):
+        """True when no gesture is in progress and both arms are down"""
+        return (not self.active.any() and bool(np.all(self.elevations < release_threshold)) 
+                and all(machine.state == GestureStateMachine.DOWN for machine in self.machines))
+        
+    def held(self):
+        """The fired rule that is still being held, or None"""
+        for rule, machine, active in zip(self.rules, self.machines, self.active):
+            if active and machine.state == GestureStateMachine.RAISED:
+                return rule
         return None
+        
+    def defer(self, rule):
+        """Fire rule again on its next active frame"""
+        self.machines[self.rules.index(rule)].defer()
+        
+    def set_confirm_frames(self, confirm_frames):
+        """Change the number of frames that confirm a gesture"""
+        for machine in self.machines:
+            machine.confirm_frames = max(1, confirm_frames)
+
+class PerformanceGovernor:
+    """Trade pose model complexity and inference stride against a per-frame time budget.
+    
+    Level 0 is the configured model at every frame; higher levels use lighter
+    models, then skip frames. While no pose is seen inference drops to idle_fps.
+    """
+    def __init__(self, model_complexity=1, target_fps=30, idle_fps=5, enabled=True, idle_after=0.5):
+        self.levels = [(complexity, 1) for complexity in range(model_complexity, -1, -1)]
+        self.levels += [(0, 2), (0, 3)]
+        self.enabled = enabled
+        self.budget = 1.0 / max(target_fps, 1)
+        self.idle_interval = 1.0 / max(idle_fps, 0.1)
+        self.idle_after = idle_after
+        self.level = 0
+        self.idle = False
+        self.frame_cost = None  # Moving average of the processing time of an inferred frame
+        self._over_budget = 0
+        self._under_budget = 0
+        self._frame_index = 0
+        self._last_inference = None
+        self._last_pose_time = None
+        
+    @property
+    def model_complexity(self):
+        return self.levels[self.level][0]
+        
+    @property
+    def stride(self):
+        return self.levels[self.level][1]
+        
+    def should_infer(self, timestamp):
+        """Decide whether the frame captured at timestamp gets pose inference"""
+        self._frame_index += 1
+        if not self.enabled:
+            return True
+        if self.idle:
+            return self._last_inference is None or timestamp - self._last_inference >= self.idle_interval
+        return self._frame_index % self.stride == 0
+        
+    def report(self, processing_time, pose_found, timestamp):
+        """Feed back the cost of an inferred frame, returns True if the model complexity changed"""
+        self._last_inference = timestamp
+        if not self.enabled:
+            return False
+            
+        # Idle mode while nobody is in front of the camera
+        if pose_found:
+            self._last_pose_time = timestamp
+            self.idle = False
+        elif self._last_pose_time is None or timestamp - self._last_pose_time > self.idle_after:
+            self.idle = True
+            
+        if self.frame_cost is None:
+            self.frame_cost = processing_time
+        else:
+            self.frame_cost += 0.1 * (processing_time - self.frame_cost)
+        if self.idle:
+            return False
+            
+        # Skipped frames are free, so the budget is spread over the stride
+        cost = self.frame_cost / self.stride
+        if cost > self.budget:
+            self._over_budget += 1
+            self._under_budget = 0
+        elif cost < 0.5 * self.budget:
+            self._under_budget += 1
+            self._over_budget = 0
+        else:
+            self._over_budget = self._under_budget = 0
+            
+        previous_complexity = self.model_complexity
+        # Step down quickly, step back up only after a long quiet stretch
+        if self._over_budget >= 15 and self.level < len(self.levels) - 1:
+            self._set_level(self.level + 1)
+        elif self._under_budget >= 90 and self.level > 0:
+            self._set_level(self.level - 1)
+        return self.model_complexity != previous_complexity
+        
+    def _set_level(self, level):
+        self.level = level
+        self._over_budget = self._under_budget = 0
+        
+    def describe(self):
+        """Current level for the debug output"""
+        if not self.enabled:
+            return "governor off"
+        if self.idle:
+            return f"idle ({1.0 / self.idle_interval:.0f} fps)"
+        cost = f", {self.frame_cost * 1000:.1f} ms/frame" if self.frame_cost is not None else ""
+        return f"level {self.level}: complexity {self.model_complexity}, stride {self.stride}{cost}"
+
+class MotionGate:
+    """Skip pose inference while the scene is static.
+    
+    Each frame is shrunk to a small grayscale image and compared with the one
+    seen at the last inference. While too few pixels changed, and the caller
+    says no gesture is in progress, inference only runs every static_interval
+    seconds; any motion brings it back at once.
+    """
+    def __init__(self, enabled=True, threshold=0.005, static_interval=1.0, width=80, pixel_delta=15):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.static_interval = static_interval
+        self.width = width
+        self.pixel_delta = pixel_delta
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self.buffers = FrameBuffers()
+        self._reference = None  # Small grayscale image seen by the last inference
+        self._last_inference = None
+        
+    def _thumbnail(self, frame):
+        """Grayscale copy of the frame, width pixels wide"""
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        # Linear samples a few source pixels per output pixel, its cost does not grow with the
+        # frame size like INTER_AREA's; pixel_delta absorbs the extra noise
+        small = cv2.resize(frame, size, dst=self.buffers.get("small", (size[1], size[0], 3)), 
+                           interpolation=cv2.INTER_LINEAR)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self.buffers.get("gray", small.shape[:2]))
+        
+    def should_infer(self, frame, timestamp, at_rest):
+        """Decide whether a frame needs pose inference, at_rest: no gesture in progress"""
+        if not self.enabled:
+            return True
+        self.frames_checked += 1
+        gray = self._thumbnail(frame)
+        if at_rest and self._reference is not None and self._reference.shape == gray.shape:
+            difference = cv2.absdiff(gray, self._reference, dst=self.buffers.get("difference", gray.shape))
+            changed = cv2.countNonZero(cv2.threshold(difference, self.pixel_delta, 255, cv2.THRESH_BINARY, 
+                                                     dst=difference)[1])
+            static = changed < self.threshold * gray.size
+            if static and timestamp - self._last_inference < self.static_interval:
+                self.frames_skipped += 1
+                return False
+        # Keep what the model is about to see as the new reference
+        if self._reference is None or self._reference.shape != gray.shape:
+            self._reference = np.empty_like(gray)
+        np.copyto(self._reference, gray)
+        self._last_inference = timestamp
+        return True
+        
+    def skipped_fraction(self):
+        """Fraction of the checked frames that skipped inference"""
+        return self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+        
+    def describe(self):
+        """Short status for the overlay and reports"""
+        if not self.enabled:
+            return "motion gate off"
+        return f"motion gate: {self.skipped_fraction():.0%} of frames skipped"
+
+class DebugLog:
+    """Debug records written to the console and/or a JSON-lines file by a background thread.
+    
+    The detection thread only appends to a bounded ring buffer, so slow or piped
+    stdout never stalls it. When the buffer is full the oldest records are lost.
+    """
+    def __init__(self, to_console=True, log_file="", sample_every=30, capacity=2048):
+        self.to_console = to_console
+        self.log_file = log_file
+        self.enabled = bool(to_console or log_file)
+        self.sample_every = sample_every
+        self.records_dropped = 0
+        self._buffer = deque(maxlen=capacity)
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+        
+    def start(self):
+        """Start the writer thread"""
+        if self.enabled:
+            self._running = True
+            self._thread = threading.Thread(target=self._writer_loop, name="HandySlidesDebugLog", daemon=True)
+            self._thread.start()
+        return self
+        
+    def set_console(self, to_console):
+        """Turn console output on or off while running"""
+        self.to_console = to_console
+        self.enabled = bool(to_console or self.log_file)
+        if self.enabled and self._thread is None:
+            self.start()
+            
+    def sample(self, frame_index):
+        """True if per-frame details should be logged for this frame"""
+        return self.enabled and self.sample_every > 0 and frame_index % self.sample_every == 0
+        
+    def log(self, kind, **fields):
+        """Queue a record, never blocks"""
+        if not self.enabled:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            self.records_dropped += 1
+        self._buffer.append((time.time(), kind, fields))
+        self._wakeup.set()
+        
+    def _format(self, kind, fields):
+        """Human readable console line for a record"""
+        if kind == "landmarks":
+            return (f"L.Shoulder.y: {fields['left_shoulder']:.3f}, L.Wrist.y: {fields['left_wrist']:.3f}\n"
+                    f"R.Shoulder.y: {fields['right_shoulder']:.3f}, R.Wrist.y: {fields['right_wrist']:.3f}")
+        if kind == "action":
+            overruled = "" if fields.get("sent", True) else " (overruled by another camera)"
+            return f"{fields['gesture']} detected! Action: {fields['action']} -> Key: {fields['key']}{overruled}"
+        details = ", ".join(f"{name}: {value}" for name, value in fields.items())
+        return f"[{kind}] {details}"
+        
+    def _writer_loop(self):
+        """Drain the ring buffer in batches"""
+        log_file = open(self.log_file, 'a', encoding='utf-8') if self.log_file else None
+        try:
+            while self._running or self._buffer:
+                self._wakeup.wait(0.5)
+                self._wakeup.clear()
+                lines = []
+                while self._buffer:
+                    timestamp, kind, fields = self._buffer.popleft()
+                    if self.to_console:
+                        lines.append(self._format(kind, fields))
+                    if log_file is not None:
+                        record = {"t": round(timestamp, 4), "kind": kind}
+                        record.update((name, round(value, 4) if isinstance(value, float) else value) 
+                                      for name, value in fields.items())
+                        log_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                if lines:
+                    print("\n".join(lines), flush=True)
+                if log_file is not None:
+                    log_file.flush()
+        finally:
+            if log_file is not None:
+                log_file.close()
+                
+    def close(self):
+        """Write out what is left and stop the writer thread"""
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+class PoseModelLoader:
+    """Import the heavy modules and load and warm up a pose model on a background thread.
+    
+    Started while the configuration window is open, so the detection loop gets
+    a ready-to-use model instead of paying for the graph setup on its first frame.
+    """
+    def __init__(self, model_complexity=1):
+        self.model_complexity = model_complexity
+        self.pose = None
+        self.error = None
+        self.load_time = None
+        self._thread = None
+        
+    def start(self):
+        """Start loading in the background"""
+        self._thread = threading.Thread(target=self._load, name="HandySlidesPoseLoader", daemon=True)
+        self._thread.start()
+        return self
+        
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            load_heavy_modules("np", "cv2", "mp")
+            pose = mp.solutions.pose.Pose(model_complexity=self.model_complexity, 
+                                          min_detection_confidence=0.5, 
+                                          min_tracking_confidence=0.5)
+            # The first process call initialises the graph, do it on a dummy frame
+            pose.process(np.zeros((256, 256, 3), dtype=np.uint8))
+            self.pose = pose
+        except Exception as e:
+            self.error = e
+        self.load_time = time.perf_counter() - start
+        
+        try:
+            load_heavy_modules("pyautogui")
+        except Exception:
+            pass  # Reported when the key sink is created
+        
+    def ready(self):
+        """True once the model has loaded, without waiting"""
+        return self._thread is not None and not self._thread.is_alive() and self.pose is not None
+        
+    def result(self):
+        """Wait for the warmed-up model, None if loading failed"""
+        if self._thread is not None:
+            self._thread.join()
+        return self.pose
+
+def landmarks_to_array(landmarks, out=None):
+    """Pack MediaPipe landmarks into an (N, 4) float32 array of x, y, z, visibility"""
+    if out is None:
+        out = np.empty((len(landmarks.landmark), 4), dtype=np.float32)
+    for i, landmark in enumerate(landmarks.landmark):
+        out[i] = (landmark.x, landmark.y, landmark.z, landmark.visibility)
+    return out
+
+def landmarks_from_array(array):
+    """Rebuild a MediaPipe landmark list from landmarks_to_array output"""
+    landmark_pb2 = importlib.import_module("mediapipe.framework.formats.landmark_pb2")
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in array.tolist():
+        landmarks.landmark.add(x=x, y=y, z=z, visibility=visibility)
+    return landmarks
+
+# Landmark recordings: a 16 byte header, then fixed size records that np.memmap can map directly
+RECORDING_MAGIC = b"HSLANDMK"
+RECORDING_VERSION = 2  # 2 adds a session start record each time recording starts, same layout as 1
+RECORDING_SESSION_START = 2  # "present" value of a session start record
+_recording_dtypes = None
+
+def recording_dtypes():
+    """(header, record) dtypes of landmark recordings, built on first use so numpy is not imported early"""
+    global _recording_dtypes
+    if _recording_dtypes is None:
+        _recording_dtypes = (np.dtype([("magic", "S8"), ("version", "<u4"), ("record_size", "<u4")]), 
+                             np.dtype([("time", "<f8"), ("present", "u1"), ("landmarks", "<f4", (33, 4))]))
+    return _recording_dtypes
+
+class LandmarkRecorder:
+    """Append timestamped landmark arrays to a recording file, written in batches"""
+    def __init__(self, path, batch_size=64):
+        self.path = path
+        self.records_written = 0
+        self._batch = np.zeros(batch_size, dtype=recording_dtypes()[1])
+        self._count = 0
+        self._file = None
+        
+    def open(self):
+        """Open the file for appending, writing the header if it is new, and start a session"""
+        header_dtype, record_dtype = recording_dtypes()
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        if not new_file:
+            # Refuses to append to another format
+            complete_size = header_dtype.itemsize + len(read_landmark_recording(self.path)) * record_dtype.itemsize
+            if os.path.getsize(self.path) > complete_size:
+                # A crash left half a record, later records would be read out of step
+                os.truncate(self.path, complete_size)
+        self._file = open(self.path, 'ab')
+        if new_file:
+            header = np.array([(RECORDING_MAGIC, RECORDING_VERSION, record_dtype.itemsize)], dtype=header_dtype)
+            self._file.write(header.tobytes())
+        # Replays start the gesture state over here, however close the timestamps are
+        marker = np.zeros(1, dtype=record_dtype)
+        marker["time"] = time.time()
+        marker["present"] = RECORDING_SESSION_START
+        self._file.write(marker.tobytes())
+        return self
+        
+    def write(self, timestamp, landmarks=None):
+        """Add a frame, landmarks is a (33, 4) array or None when no pose was found"""
+        record = self._batch[self._count]
+        record["time"] = timestamp
+        record["present"] = landmarks is not None
+        if landmarks is not None:
+            record["landmarks"] = landmarks
+        self._count += 1
+        if self._count == len(self._batch):
+            self.flush()
+            
+    def flush(self):
+        """Write the records collected so far"""
+        if self._count and self._file is not None:
+            self._file.write(self._batch[:self._count].tobytes())
+            self._file.flush()
+            self.records_written += self._count
+        self._count = 0
+        
+    def close(self):
+        """Write the last records and close the file"""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def read_landmark_recording(path):
+    """Memory-map a recording made by LandmarkRecorder, a partly written last record is left out.
+    
+    Records with present == RECORDING_SESSION_START mark where a recording
+    session begins, version 1 files have none.
+    """
+    header_dtype, record_dtype = recording_dtypes()
+    header = np.fromfile(path, dtype=header_dtype, count=1)
+    if len(header) == 0 or header[0]["magic"] != RECORDING_MAGIC:
+        raise ValueError(f"{path} is not a HandySlides landmark recording")
+    if header[0]["version"] not in (1, RECORDING_VERSION) or header[0]["record_size"] != record_dtype.itemsize:
+        raise ValueError(f"{path} was recorded by another HandySlides version")
+    count = (os.path.getsize(path) - header_dtype.itemsize) // record_dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=record_dtype)
+    return np.memmap(path, dtype=record_dtype, mode="r", offset=header_dtype.itemsize, shape=(count,))
+
+def _pose_worker_main(buffer_names, frame_shape, settings, requests, responses):
+    """Entry point of the inference process started by PoseWorkerProcess"""
+    buffers = [shared_memory.SharedMemory(name=name) for name in buffer_names]
+    frames = [np.ndarray(frame_shape, dtype=np.uint8, buffer=buffer.buf) for buffer in buffers]
+    poses = {}
+    poses_lock = threading.Lock()
+    
+    def load_pose(model_complexity):
+        pose = mp.solutions.pose.Pose(model_complexity=model_complexity, 
+                                      min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        pose.process(np.zeros((256, 256, 3), dtype=np.uint8))
+        with poses_lock:
+            poses[model_complexity] = pose
+        return pose
+        
+    def preload(complexities):
+        # The lighter models the governor may ask for, loaded while inference keeps running
+        for model_complexity in complexities:
+            try:
+                load_pose(model_complexity)
+            except Exception as e:
+                print(f"Error loading pose model complexity {model_complexity}: {e}")
+    
+    preloader = None
+    try:
+        model_complexity = settings.get("model_complexity", 1)
+        processor = RoiPoseProcessor(load_pose(model_complexity), 
+                                     working_width=settings.get("inference_width", 640), 
+                                     roi_tracking=settings.get("roi_tracking", True), 
+                                     roi_padding=settings.get("roi_padding", 0.3))
+        responses.put(("ready", None, None, 0.0))
+        if settings.get("governor", True):
+            preloader = threading.Thread(target=preload, args=(range(model_complexity - 1, -1, -1),), daemon=True)
+            preloader.start()
+        
+        wanted = None  # Complexity asked for by the governor, switched to once loaded
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            if request[0] == "complexity":
+                wanted = request[1]
+                continue
+            if wanted is not None:
+                with poses_lock:
+                    pose = poses.get(wanted)
+                if pose is not None:
+                    processor.pose, processor.roi, wanted = pose, None, None
+                
+            _, slot, height, width = request
+            start = time.perf_counter()
+            results = processor.process(frames[slot][:height, :width])
+            array = landmarks_to_array(results.pose_landmarks) if results.pose_landmarks else None
+            responses.put(("result", slot, array, time.perf_counter() - start))
+    finally:
+        if preloader is not None:
+            preloader.join()
+        for pose in poses.values():
+            pose.close()
+        del frames
+        for buffer in buffers:
+            buffer.close()
+
+class PoseWorkerProcess:
+    """Pose inference in a separate process, fed through a pool of shared-memory frame buffers.
     
-    def execute_action(self, arm):
-        """Execute action based on raised arm and configuration"""
-        action = self.config.get(f"{arm.lower()}_arm_action")
+    A frame is copied once into a free buffer, at half size when the worker does
+    not need the full resolution. Only the buffer index travels through the queue
+    and only the compact landmark array comes back. Results are returned in
+    submission order.
+    """
+    def __init__(self, settings, slots=3, timeout=10.0):
+        self.settings = dict(settings)
+        self.frame_shape = None
+        self.slot_shape = None
+        self.slot_count = slots
+        self.timeout = timeout
+        self.process = None
+        self.buffers = []
+        self.frames = []
+        self.free_slots = deque()
+        self.frames_rejected = 0
+        self._requests = None
+        self._responses = None
+        
+    def start(self, frame_shape):
+        """Allocate the buffers for frames of this shape and start the process"""
+        context = multiprocessing.get_context("spawn")
+        self.frame_shape = frame_shape
+        self.slot_shape = self.scaled_shape(frame_shape)
+        size = int(np.prod(self.slot_shape))
+        self.buffers = [shared_memory.SharedMemory(create=True, size=size) for _ in range(self.slot_count)]
+        self.frames = [np.ndarray(self.slot_shape, dtype=np.uint8, buffer=buffer.buf) for buffer in self.buffers]
+        self.free_slots = deque(range(self.slot_count))
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self.process = context.Process(target=_pose_worker_main, name="HandySlidesPoseWorker", daemon=True, 
+                                       args=([buffer.name for buffer in self.buffers], self.slot_shape, 
+                                             self.settings, self._requests, self._responses))
+        self.process.start()
+        # Model loading happens in the worker, wait until it can take frames
+        self._responses.get(timeout=60.0)
+        return self
+        
+    def scaled_shape(self, frame_shape):
+        """Shape a frame is sent to the worker in: half size if that is still wide enough.
+        
+        With ROI tracking the worker crops before downscaling to inference_width,
+        so twice that width is kept for crops down to half the frame. Only halving
+        is done here: OpenCV averages 2x2 blocks about as fast as it copies the
+        full frame, other factors cost several times more and are left to the
+        worker process.
+        """
+        height, width = frame_shape[:2]
+        needed_width = self.settings.get("inference_width", 640)
+        if self.settings.get("roi_tracking", True):
+            needed_width *= 2
+        if not needed_width or width // 2 < needed_width:
+            return tuple(frame_shape)
+        return (height // 2, width // 2) + tuple(frame_shape[2:])
+        
+    def submit(self, frame):
+        """Queue a frame for inference, False if no buffer is free or the frame does not fit"""
+        shape = self.scaled_shape(frame.shape)
+        height, width = shape[:2]
+        buffer_height, buffer_width = self.slot_shape[:2]
+        if not self.free_slots or height > buffer_height or width > buffer_width:
+            self.frames_rejected += 1
+            return False
+        slot = self.free_slots.popleft()
+        target = self.frames[slot][:height, :width]
+        if shape == frame.shape:
+            target[:] = frame
+        else:
+            cv2.resize(frame, (width, height), dst=target, interpolation=cv2.INTER_AREA)
+        self._requests.put(("frame", slot, height, width))
+        return True
         
-        if self.config["powerpoint_keys"]:
+    def has_result(self):
+        """True if a result is waiting"""
+        return not self._responses.empty()
+        
+    def result(self):
+        """Next (landmark_array or None, processing_time), raises queue.Empty if the worker stalls"""
+        _, slot, array, elapsed = self._responses.get(timeout=self.timeout)
+        self.free_slots.append(slot)
+        return array, elapsed
+        
+    def set_model_complexity(self, model_complexity):
+        """Switch the worker to another pose model"""
+        self._requests.put(("complexity", model_complexity))
+        
+    def close(self):
+        """Stop the process and free the shared memory"""
+        if self.process is not None:
+            self._requests.put(None)
+            self.process.join(timeout=5.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        self.frames = []
+        for buffer in self.buffers:
+            buffer.close()
+            buffer.unlink()
+        self.buffers = []
+
+# Accepted values of the settings that can change while running: (type, min, max) or a tuple of choices
+SETTING_RULES = {
+    "right_arm_action": ("next", "previous"),
+    "left_arm_action": ("next", "previous"),
+    "sensitivity": ((int, float), 0.0, 1.0),
+    "cooldown": ((int, float), 0.0, 60.0),
+    "show_debug": (bool, None, None),
+    "powerpoint_keys": (bool, None, None),
+    "mirror_camera": (bool, None, None),
+    "preview_fps": ((int, float), 1, 120),
+    "inference_width": (int, 0, 8192),
+    "roi_tracking": (bool, None, None),
+    "roi_padding": ((int, float), 0.0, 5.0),
+    "release_ratio": ((int, float), 0.0, 1.0),
+    "confirm_frames": (int, 1, 60),
+    "model_complexity": (int, 0, 2),
+    "governor": (bool, None, None),
+    "target_fps": ((int, float), 1, 240),
+    "idle_fps": ((int, float), 0.1, 240),
+    "debug_sample_every": (int, 0, 100000),
+    "camera_index": (int, 0, 64),
+    "camera_profiles": (dict, None, None),
+    "gesture_rules": (list, None, None),
+    "gesture_window": (int, 2, 1024),
+    "motion_gate": (bool, None, None),
+    "motion_threshold": ((int, float), 0.0, 1.0),
+    "static_infer_interval": ((int, float), 0.0, 60.0),
+    "smoothing": (bool, None, None),
+    "smoothing_min_cutoff": ((int, float), 0.01, 100.0),
+    "smoothing_beta": ((int, float), 0.0, 1000.0),
+    "prediction_time": ((int, float), 0.0, 1.0),
+    "event_bus": (str, None, None),
+    "event_queue_size": (int, 1, 100000),
+}
+
+# Settings that are only read at startup
+RESTART_SETTINGS = ("headless", "inference_process", "cameras", "key_output", "async_keys", "profile", 
+                    "trace_file", "debug_log_file", "language", "hot_reload", "camera_probe", 
+                    "record_landmarks", "event_bus", "event_queue_size")
+
+def validate_settings(settings):
+    """Check the values of known settings, returns a list of error messages"""
+    errors = []
+    for name, rule in SETTING_RULES.items():
+        if name not in settings:
+            continue
+        value = settings[name]
+        if isinstance(rule[0], str):
+            if value not in rule:
+                errors.append(f"{name} must be one of {', '.join(rule)}")
+            continue
+        kind, low, high = rule
+        # bool is an int subclass, do not accept it for numbers
+        if not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+            errors.append(f"{name} has the wrong type")
+        elif low is not None and not low <= value <= high:
+            errors.append(f"{name} must be between {low} and {high}")
+    if not errors and settings.get("gesture_rules"):
+        try:
+            [GestureRule.from_dict(spec) for spec in settings["gesture_rules"]]
+        except (TypeError, ValueError, AttributeError, IndexError) as e:
+            errors.append(f"gesture_rules: {e}")
+    return errors
+
+class ConfigWatcher:
+    """Poll the settings file's modification time and load validated changes in the background"""
+    def __init__(self, config_file, interval=1.0):
+        self.config_file = config_file
+        self.interval = interval
+        self._mtime = self._current_mtime()
+        self._saved = self._load() or {}  # File contents the pending changes are compared to
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def _current_mtime(self):
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+            
+    def _load(self):
+        """Settings in the file, None if it cannot be read or parsed"""
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                saved_settings = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return saved_settings if isinstance(saved_settings, dict) else None
+            
+    def start(self):
+        """Start polling"""
+        self._thread = threading.Thread(target=self._watch_loop, name="HandySlidesConfigWatcher", daemon=True)
+        self._thread.start()
+        return self
+        
+    def _watch_loop(self):
+        while not self._stop.wait(self.interval):
+            mtime = self._current_mtime()
+            if mtime is None or mtime == self._mtime:
+                continue
+            saved_settings = self._load()
+            if saved_settings is None:
+                continue  # Probably caught mid-write, try again on the next poll
+            self._mtime = mtime
+            errors = validate_settings(saved_settings)
+            if errors:
+                print(f"Ignoring changes to {self.config_file}: {'; '.join(errors)}")
+                continue
+            with self._lock:
+                for name, value in saved_settings.items():
+                    if self._saved.get(name) != value:
+                        self._pending[name] = value
+                self._saved = saved_settings
+                    
+    def take(self):
+        """Return the settings changed in the file since the last call"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+        
+    def stop(self):
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+class HandySlides:
+    def __init__(self, config, frame_source=None, key_sink=None, pose_loader=None, debug_log=None, 
+                 event_bus=None):
+        self.config_store = config
+        self.config = config.settings
+        self.last_press_time = 0
+        self.gestures = self.create_gesture_engine()
+        self.landmark_filter = self.create_landmark_filter()
+        self._landmark_array = np.zeros((33, 4), dtype=np.float32)
+        self.pose_loader = pose_loader
+        
+        # Where frames come from and where key presses go
+        if frame_source is None:
+            index = self.config.get("camera_index", 0)
+            frame_source = CameraSource(index, self.config.get("camera_profiles", {}).get(str(index)))
+        self.frame_source = frame_source
+        if key_sink is None:
+            key_sink = create_key_sink(self.config.get("key_output", "pyautogui"))
+        self.key_dispatcher = None
+        if self.config.get("async_keys", True):
+            # Injection (and pyautogui's pause after it) happens off the detection thread
+            self.key_dispatcher = KeyDispatcher(key_sink).start()
+        self.key_sink = key_sink
+        self.key_output = self.key_dispatcher if self.key_dispatcher is not None else key_sink
+        
+        self.profiler = StageProfiler(enabled=self.config.get("profile", False), 
+                                      trace=bool(self.config.get("trace_file")))
+        self.governor = self.create_governor()
+        self.motion_gate = MotionGate(enabled=self.config.get("motion_gate", True), 
+                                      threshold=self.config.get("motion_threshold", 0.005), 
+                                      static_interval=self.config.get("static_infer_interval", 1.0))
+        self._owns_debug_log = debug_log is None
+        if debug_log is None:
+            debug_log = DebugLog(to_console=self.config["show_debug"], 
+                                 log_file=self.config.get("debug_log_file", ""), 
+                                 sample_every=self.config.get("debug_sample_every", 30)).start()
+        self.debug_log = debug_log
+        self.frame_index = 0
+        self.frames_published = 0
+        self.poses = {}  # model complexity -> MediaPipe Pose
+        self._loading_poses = set()  # Complexities being built in the background
+        self.processor = None
+        self.worker = None
+        self.renderer = None
+        self.frame_copies = FrameBuffers()  # Frames kept for the preview while the pose worker runs
+        self.config_watcher = None
+        self._pending_swaps = deque()  # Callables that install objects rebuilt in the background
+        self._rebuild_threads = []
+        self._gc_runs_at_start = 0
+        self.last_landmarks = None
+        self.last_status = ("Pose not detected", (0, 0, 255))
+        self.recorder = None
+        # Gesture, cooldown and pose events for other local tools, started by run() if not shared
+        self.event_bus = event_bus
+        self._owns_event_bus = event_bus is None
+        self._pose_present = False
+        self._deferred_gesture = None
+        
+    def create_gesture_engine(self):
+        """Gesture rules for the current settings, the default gestures if they are invalid"""
+        try:
+            rules = create_gesture_rules(self.config)
+        except (TypeError, ValueError, AttributeError, IndexError) as e:
+            print(f"Error in gesture_rules, using the default gestures: {e}")
+            rules = create_gesture_rules(dict(self.config, gesture_rules=[]))
+        return GestureRuleEngine(rules, window_size=self.config.get("gesture_window", 32), 
+                                 confirm_frames=self.config.get("confirm_frames", 2), 
+                                 prediction_time=self.config.get("prediction_time", 0.08))
+                                 
+    @property
+    def mp_pose(self):
+        """MediaPipe pose solution, imported on first use so the gesture logic runs without it"""
+        return mp.solutions.pose
+        
+    @property
+    def mp_drawing(self):
+        """MediaPipe drawing helpers"""
+        return mp.solutions.drawing_utils
+    
+    def create_landmark_filter(self):
+        """Landmark smoothing for the current settings, None when it is off"""
+        if not self.config.get("smoothing", True):
+            return None
+        return LandmarkFilter(min_cutoff=self.config.get("smoothing_min_cutoff", 1.5), 
+                              beta=self.config.get("smoothing_beta", 5.0))
+    
+    def update_gestures(self, timestamp, array):
+        """Advance the gesture rules with one pose, returns the rule whose gesture was just confirmed"""
+        raise_threshold = self.config["sensitivity"]
+        release_threshold = raise_threshold * self.config.get("release_ratio", 0.5)
+        
+        velocity = None
+        if self.landmark_filter is not None:
+            with self.profiler.stage("smoothing"):
+                array, velocity = self.landmark_filter.filter(array, timestamp)
+        # State changes are only worth tracking when they get logged
+        previous_states = self.gestures.states() if self.debug_log.enabled else None
+        fired = self.gestures.evaluate(timestamp, raise_threshold, release_threshold, array, velocity)
+        
+        if self.debug_log.sample(self.frame_index):
+            points = self.gestures.window.landmarks[self.gestures.window.index]
+            self.debug_log.log("landmarks", left_shoulder=float(points[LEFT_SHOULDER, 1]), 
+                               left_wrist=float(points[LEFT_WRIST, 1]), 
+                               right_shoulder=float(points[RIGHT_SHOULDER, 1]), 
+                               right_wrist=float(points[RIGHT_WRIST, 1]))
+        if previous_states is not None:
+            for name, state in self.gestures.states().items():
+                if state != previous_states[name]:
+                    self.debug_log.log("gesture_state", gesture=name, state=state)
+        return fired
+    
+    def execute_action(self, rule, timestamp=None):
+        """Send the key of a confirmed gesture, returns the key, None if the key output dropped it"""
+        if rule.key is not None:
+            key = rule.key
+        elif self.config["powerpoint_keys"]:
             # Use keyboard arrows
-            key = "right" if action == "next" else "left"
+            key = ACTION_KEYS[rule.action][0]
         else:
             # Use Page Up/Down
-            key = "pagedown" if action == "next" else "pageup"
+            key = ACTION_KEYS[rule.action][1]
             
-        pyautogui.press(key)
+        with self.profiler.stage("keypress"):
+            # Only an arbitrated sink reports a dropped press, the others return None
+            sent = self.key_output.press(key, timestamp) is not False
         
-        if self.config["show_debug"]:
-            print(f"{arm} arm raised! Action: {action} -> Key: {key}")
+        self.debug_log.log("action", gesture=rule.name, action=rule.action or "key", key=key, sent=sent)
+        return key if sent else None
     
     def add_status_text(self, frame, text, color=(0, 255, 0)):
         """Add status text to frame"""
         cv2.putText(frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
                    0.7, color, 2)
     
+    def add_overlay_lines(self, frame, lines, color=(255, 255, 0)):
+        """Add small text lines below the status text"""
+        for i, line in enumerate(lines):
+            cv2.putText(frame, line, (10, 55 + i * 18), cv2.FONT_HERSHEY_SIMPLEX, 
+                       0.45, color, 1)
+    
+    def get_pose(self, model_complexity):
+        """Return the pose model for a complexity, created on first use"""
+        loader = self.pose_loader
+        if model_complexity not in self.poses and loader is not None and loader.model_complexity == model_complexity:
+            # Take over the model warmed up in the background
+            self.pose_loader = None
+            if loader.result() is not None:
+                self.poses[model_complexity] = loader.pose
+        if model_complexity not in self.poses:
+            self.poses[model_complexity] = self.mp_pose.Pose(model_complexity=model_complexity, 
+                                                             min_detection_confidence=0.5, 
+                                                             min_tracking_confidence=0.5)
+        return self.poses[model_complexity]
+    
+    def load_pose_in_background(self, model_complexity):
+        """Build and warm up a pose model on a helper thread, detection keeps the current model meanwhile"""
+        if model_complexity in self.poses or model_complexity in self._loading_poses:
+            return
+        self._loading_poses.add(model_complexity)
+        def build():
+            pose = self.mp_pose.Pose(model_complexity=model_complexity, 
+                                     min_detection_confidence=0.5, min_tracking_confidence=0.5)
+            pose.process(np.zeros((256, 256, 3), dtype=np.uint8))
+            return pose
+        def install(pose):
+            self._loading_poses.discard(model_complexity)
+            if model_complexity in self.poses:
+                pose.close()
+                return
+            self.poses[model_complexity] = pose
+            processor = self.processor
+            if (isinstance(processor, RoiPoseProcessor) and self.governor.model_complexity == model_complexity 
+                    and processor.pose is not pose):
+                # The governor asked for this model while it was loading
+                processor.pose = pose
+                processor.roi = None
+        self._rebuild_in_background(f"pose model {model_complexity}", build, install)
+        
+    def preload_poses(self):
+        """Load the lighter models the governor may switch to, so switching never stalls a frame"""
+        if self.governor.enabled:
+            for complexity, _ in self.governor.levels:
+                self.load_pose_in_background(complexity)
+        
+    def close_poses(self):
+        """Release all pose models"""
+        for pose in self.poses.values():
+            pose.close()
+        self.poses = {}
+    
+    def close(self):
+        """Release the models and flush pending key presses, recordings and debug records"""
+        self.close_poses()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"{self.recorder.records_written} frames of landmarks recorded to {self.recorder.path}")
+            self.recorder = None
+        if self.key_dispatcher is not None:
+            self.key_dispatcher.close()
+        if self._owns_event_bus and self.event_bus is not None:
+            self.event_bus.close()
+            stats = self.event_bus.stats()
+            print(f"Events published: {stats['published']}, dropped: {stats['dropped']}")
+            self.event_bus = None
+        if self._owns_debug_log:
+            self.debug_log.close()
+    
+    def create_governor(self):
+        """Performance governor for the current settings"""
+        return PerformanceGovernor(model_complexity=self.config.get("model_complexity", 1), 
+                                   target_fps=self.config.get("target_fps", 30), 
+                                   idle_fps=self.config.get("idle_fps", 5), 
+                                   enabled=self.config.get("governor", True))
+        
+    def create_processor(self):
+        """Create the inference stage with the configured resolution and ROI tracking"""
+        return RoiPoseProcessor(self.get_pose(self.governor.model_complexity), 
+                                working_width=self.config.get("inference_width", 640), 
+                                roi_tracking=self.config.get("roi_tracking", True), 
+                                roi_padding=self.config.get("roi_padding", 0.3), 
+                                profiler=self.profiler)
+    
+    def mirror_results(self, landmarks):
+        """Mirror landmarks instead of pixels when the camera image is mirrored"""
+        if landmarks and self.config["mirror_camera"]:
+            with self.profiler.stage("mirror"):
+                mirror_landmarks(landmarks)
+        return landmarks
+    
+    def process_frame(self, processor, frame, capture_time):
+        """Detect gestures on one frame and trigger key presses.
+        
+        Returns the unflipped frame, the landmarks (mirrored if configured) and the status line.
+        """
+        start = time.perf_counter()
+        self.frame_index += 1
+                
+        # Frames skipped by the governor or on a static scene keep the last result
+        if not self.should_infer(frame, capture_time):
+            return frame, self.last_landmarks, self.last_status
+        results = processor.process(frame)
+        landmarks = self.mirror_results(results.pose_landmarks)
+        status = self.handle_landmarks(landmarks, capture_time)
+        self.report_inference(processor, time.perf_counter() - start, landmarks, capture_time)
+        return frame, landmarks, status
+    
+    def should_infer(self, frame, capture_time):
+        """Ask the governor, then the motion gate, whether this frame gets pose inference"""
+        if not self.governor.should_infer(capture_time):
+            return False
+        if not self.motion_gate.enabled:
+            return True
+        release_threshold = self.config["sensitivity"] * self.config.get("release_ratio", 0.5)
+        at_rest = not self.last_landmarks or self.gestures.at_rest(release_threshold)
+        with self.profiler.stage("motion"):
+            return self.motion_gate.should_infer(frame, capture_time, at_rest)
+    
+    def handle_landmarks(self, landmarks, capture_time, array=None):
+        """Run the gesture logic on an inference result, returns the status line.
+        
+        array: the landmarks as a landmarks_to_array array when already available, 
+        landmarks may then be None
+        """
+        pose_found = array is not None or bool(landmarks)
+        if pose_found:
+            if array is None:
+                array = landmarks_to_array(landmarks, out=self._landmark_array)
+            with self.profiler.stage("gesture"):
+                gesture = self.update_gestures(capture_time, array)
+            
+            if gesture:
+                status = self.act_on_gesture(gesture, capture_time)
+            else:
+                held = self.gestures.held()
+                if held:
+                    status = (f"{held.name} raised - lower it to continue", (0, 165, 255))
+                else:
+                    status = ("Ready - Raise your arm", (255, 255, 255))
+
+        else:
+            self.gestures.skip(capture_time)
+            if self.landmark_filter is not None:
+                self.landmark_filter.reset()
+            status = ("Pose not detected", (0, 0, 255))
+            
+        if self.recorder is not None:
+            # Unfiltered, so replays can try other smoothing settings
+            self.recorder.write(capture_time, array if pose_found else None)
+        if self.event_bus is not None and pose_found != self._pose_present:
+            self.publish("pose", capture_time, present=pose_found)
+        self._pose_present = pose_found
+        
+        self.last_landmarks = landmarks
+        self.last_status = status
+        return status
+    
+    def act_on_gesture(self, gesture, capture_time):
+        """Send the key of a confirmed gesture unless the cooldown is running, returns the status line"""
+        remaining = self.config["cooldown"] - (capture_time - self.last_press_time)
+        if remaining <= 0:
+            key = self.execute_action(gesture, capture_time)
+            self._deferred_gesture = None
+            if key is None:
+                # Overruled by another camera, nothing was sent so no cooldown either
+                return (f"{gesture.name} overruled", (0, 165, 255))
+            self.last_press_time = capture_time
+            if self.event_bus is not None:
+                self.publish("gesture", capture_time, gesture=gesture.name, action=gesture.action or "key", key=key)
+                if self.config["cooldown"] > 0:
+                    self.publish("cooldown", capture_time, seconds=self.config["cooldown"])
+            return (f"{gesture.name} detected!", (0, 255, 0))
+        # Gesture confirmed during the cooldown, fire once it is over
+        self.gestures.defer(gesture)
+        if self.event_bus is not None and self._deferred_gesture is not gesture:
+            # Once per gesture, it is confirmed again on every frame until the cooldown ends
+            self.publish("deferred", capture_time, gesture=gesture.name, remaining=round(remaining, 3))
+        self._deferred_gesture = gesture
+        return (f"Cooldown: {remaining:.1f}s", (0, 165, 255))
+        
+    def publish(self, kind, capture_time, **fields):
+        """Send an event to the event bus, tagged with this camera"""
+        self.event_bus.publish(kind, capture_time, camera=self.config.get("camera_index", 0), **fields)
+    
+    def replay(self, times, landmarks, present):
+        """Run a landmark recording through the gesture rules and cooldown, far faster than real time"""
+        raise_threshold = self.config["sensitivity"]
+        release_threshold = raise_threshold * self.config.get("release_ratio", 0.5)
+        velocities = None
+        landmark_filter = self.create_landmark_filter()
+        if landmark_filter is not None:
+            landmarks, velocities = landmark_filter.filter_batch(times, landmarks, present)
+        active, triggered, ended = self.gestures.evaluate_batch(times, landmarks, present, raise_threshold, 
+                                                                release_threshold, velocities)
+        # Only the state machines and the cooldown run frame by frame
+        triggered, ended = triggered.tolist(), ended.tolist()
+        for i in np.flatnonzero(present).tolist():
+            gesture = self.gestures.step(active[i], triggered[i], ended[i])
+            if gesture is not None:
+                self.act_on_gesture(gesture, float(times[i]))
+    
+    def report_inference(self, processor, processing_time, landmarks, capture_time):
+        """Feed the governor and switch the pose model when it asks for it"""
+        level = self.governor.level, self.governor.idle
+        if self.governor.report(processing_time, bool(landmarks), capture_time):
+            # Switch model, its tracking starts over on the full frame
+            model_complexity = self.governor.model_complexity
+            if isinstance(processor, PoseWorkerProcess):
+                processor.set_model_complexity(model_complexity)
+            elif model_complexity in self.poses:
+                processor.pose = self.poses[model_complexity]
+                processor.roi = None
+            else:
+                # Creating a model (and downloading it on first use) would stall this frame
+                self.load_pose_in_background(model_complexity)
+        if (self.governor.level, self.governor.idle) != level:
+            self.debug_log.log("governor", level=self.governor.describe())
+    
+    def start_allocation_count(self):
+        """Remember the garbage collector state before the detection loop"""
+        self._gc_runs_at_start = gc.get_stats()[0]["collections"]
+    
+    def allocation_stats(self, renderer=None):
+        """Frame buffer allocations and young-generation GC runs per published frame.
+        
+        Every frame buffer allocation is a full frame of memory churn; a young GC run
+        happens roughly every 700 net new Python objects.
+        """
+        frames = max(self.frames_published, 1)
+        buffer_allocations = self.frame_source.stats().get("buffer allocations", 0)
+        if self.processor is not None:
+            buffer_allocations += self.processor.buffers.allocations
+        if renderer is not None:
+            buffer_allocations += renderer.buffers.allocations
+        buffer_allocations += self.motion_gate.buffers.allocations + self.frame_copies.allocations
+        gc_runs = gc.get_stats()[0]["collections"] - self._gc_runs_at_start
+        return {"buffer_allocations_per_frame": round(buffer_allocations / frames, 4), 
+                "gc_runs_per_frame": round(gc_runs / frames, 4)}
+    
+    def _publish(self, frame, landmarks, status, renderer):
+        """Hand a finished frame to the preview and count it"""
+        self.frames_published += 1
+        if self.frames_published == 1:
+            self.debug_log.log("startup", first_frame_after=f"{time.perf_counter() - LAUNCH_TIME:.2f}s")
+        # Drawing and display happen on the preview thread
+        if renderer is not None:
+            renderer.submit(frame, landmarks, *status)
+        self.profiler.tick()
+    
+    def _detect_inline(self, stop_requested, renderer):
+        """Detection loop with inference on this thread"""
+        self.processor = self.create_processor()
+        self.preload_poses()
+        while not stop_requested.is_set():
+            self.apply_config_changes()
+            with self.profiler.stage("capture"):
+                ret, frame, capture_time = self.frame_source.read()
+            if not ret:
+                print("Error capturing frame.")
+                break
+
+            frame, landmarks, status = self.process_frame(self.processor, frame, capture_time)
+            self._publish(frame, landmarks, status, renderer)
+    
+    def _detect_pipelined(self, stop_requested, renderer):
+        """Detection loop with inference in a worker process, capturing frame N+1 while N is inferred"""
+        worker = self.worker = PoseWorkerProcess(self.worker_settings())
+        in_flight = deque()  # (frame, capture_time) in submission order
+        try:
+            while not stop_requested.is_set():
+                self.apply_config_changes()
+                if self.worker is not worker:
+                    # A worker with new settings is ready, finish the frames of the old one first
+                    while in_flight:
+                        self._finish_inference(worker, *in_flight.popleft(), renderer)
+                    worker.close()
+                    worker = self.worker
+                    
+                with self.profiler.stage("capture"):
+                    ret, frame, capture_time = self.frame_source.read()
+                if not ret:
+                    print("Error capturing frame.")
+                    break
+                if worker.process is None or frame.shape != worker.frame_shape:
+                    # First frame, or a camera with another resolution was swapped in
+                    while in_flight:
+                        self._finish_inference(worker, *in_flight.popleft(), renderer)
+                    worker.close()
+                    worker.start(frame.shape)
+                    
+                self.frame_index += 1
+                if self.should_infer(frame, capture_time) and worker.submit(frame):
+                    if renderer is not None:
+                        # The preview shows it after the next read, when the capture buffer is reused.
+                        # At most two frames are in flight, three copies never overwrite one in use.
+                        kept = self.frame_copies.get(f"in_flight{self.frame_index % 3}", frame.shape)
+                        np.copyto(kept, frame)
+                        frame = kept
+                    in_flight.append((frame, capture_time))
+                elif not in_flight:
+                    self._publish(frame, self.last_landmarks, self.last_status, renderer)
+                    
+                # Leave one frame in flight so the next capture overlaps its inference
+                while in_flight and (len(in_flight) > 1 or worker.has_result()):
+                    self._finish_inference(worker, *in_flight.popleft(), renderer)
+        except queue.Empty:
+            print("Error: pose worker process stopped responding.")
+        finally:
+            self._finish_rebuilds()
+            worker.close()
+            if self.worker is not worker:
+                self.worker.close()
+    
+    def _finish_inference(self, worker, frame, capture_time, renderer):
+        """Collect the worker's result for a frame and run the gesture logic on it"""
+        with self.profiler.stage("inference_wait"):
+            array, processing_time = worker.result()
+        end = time.perf_counter()
+        self.profiler.record("inference", end - processing_time, end)
+        landmarks = None
+        if array is not None:
+            if self.config["mirror_camera"]:
+                with self.profiler.stage("mirror"):
+                    array = mirror_landmark_array(array)
+            landmarks = landmarks_from_array(array)
+        status = self.handle_landmarks(landmarks, capture_time, array)
+        self.report_inference(worker, processing_time, landmarks, capture_time)
+        self._publish(frame, landmarks, status, renderer)
+        
+    def worker_settings(self):
+        """Settings handed to a pose worker process"""
+        return dict(self.config, model_complexity=self.governor.model_complexity)
+    
+    def apply_config_changes(self):
+        """Between frames: install objects rebuilt in the background and apply new settings"""
+        while self._pending_swaps:
+            self._pending_swaps.popleft()()
+        if self.config_watcher is None:
+            return
+        file_changes = self.config_watcher.take()
+        if file_changes:
+            self.apply_settings(file_changes)
+            
+    def apply_settings(self, file_changes):
+        """Switch to new settings at once; parts that need the camera or model rebuilt follow later"""
+        restart_needed = set(file_changes).intersection(RESTART_SETTINGS)
+        if restart_needed:
+            print(f"Restart HandySlides to apply: {', '.join(sorted(restart_needed))}")
+        new_config = dict(self.config)
+        new_config.update((name, value) for name, value in file_changes.items() if name not in RESTART_SETTINGS)
+        changed = {name for name in new_config if new_config[name] != self.config.get(name)}
+        if not changed:
+            return
+        old_config = self.config
+        # One assignment, every stage sees either the old or the new settings
+        self.config = new_config
+        self.config_store.settings = new_config
+        print(f"Settings reloaded: {', '.join(sorted(changed))}")
+        
+        if {"smoothing", "smoothing_min_cutoff", "smoothing_beta"} & changed:
+            self.landmark_filter = self.create_landmark_filter()
+        if {"gesture_rules", "gesture_window", "left_arm_action", "right_arm_action", "prediction_time"} & changed:
+            self.gestures = self.create_gesture_engine()
+        elif "confirm_frames" in changed:
+            self.gestures.set_confirm_frames(new_config["confirm_frames"])
+        if {"show_debug", "debug_sample_every"} & changed and self._owns_debug_log:
+            self.debug_log.set_console(new_config["show_debug"])
+            self.debug_log.sample_every = new_config.get("debug_sample_every", 30)
+        if "preview_fps" in changed and self.renderer is not None:
+            self.renderer.frame_interval = 1.0 / max(new_config["preview_fps"], 1)
+        if {"target_fps", "idle_fps", "governor"} & changed:
+            # Keep the current level, only the budgets change
+            self.governor.budget = 1.0 / max(new_config.get("target_fps", 30), 1)
+            self.governor.idle_interval = 1.0 / max(new_config.get("idle_fps", 5), 0.1)
+            self.governor.enabled = new_config.get("governor", True)
+            
+        if {"motion_gate", "motion_threshold", "static_infer_interval"} & changed:
+            self.motion_gate.enabled = new_config.get("motion_gate", True)
+            self.motion_gate.threshold = new_config.get("motion_threshold", 0.005)
+            self.motion_gate.static_interval = new_config.get("static_infer_interval", 1.0)
+            
+        inference_settings = {"inference_width", "roi_tracking", "roi_padding"}
+        if "model_complexity" in changed:
+            self._rebuild_model(new_config["model_complexity"])
+        elif self.worker is not None and inference_settings & changed:
+            self._rebuild_worker()
+        elif self.processor is not None and inference_settings & changed:
+            self.processor.working_width = new_config.get("inference_width", 640)
+            self.processor.roi_tracking = new_config.get("roi_tracking", True)
+            self.processor.roi_padding = new_config.get("roi_padding", 0.3)
+            self.processor.roi = None
+            
+        index = new_config.get("camera_index", 0)
+        profile = new_config.get("camera_profiles", {}).get(str(index))
+        old_profile = old_config.get("camera_profiles", {}).get(str(old_config.get("camera_index", 0)))
+        if isinstance(self.frame_source, CameraSource) and (index != self.frame_source.index or profile != old_profile):
+            self._rebuild_camera(index, profile)
+            
+    def _rebuild_in_background(self, what, build, install):
+        """Run build() on a helper thread, then install(result) between two frames"""
+        def rebuild():
+            try:
+                result = build()
+            except Exception as e:
+                print(f"Error applying new settings ({what}): {e}")
+                return
+            self._pending_swaps.append(lambda: install(result))
+        thread = threading.Thread(target=rebuild, name=f"HandySlidesRebuild {what}", daemon=True)
+        self._rebuild_threads = [t for t in self._rebuild_threads if t.is_alive()] + [thread]
+        thread.start()
+        
+    def _finish_rebuilds(self):
+        """Wait for background rebuilds and install them, so they get released with the rest"""
+        for thread in self._rebuild_threads:
+            thread.join()
+        self._rebuild_threads = []
+        while self._pending_swaps:
+            self._pending_swaps.popleft()()
+        
+    def _rebuild_camera(self, index, profile):
+        """Open the new camera while the old one keeps streaming, then swap them"""
+        def build():
+            source = CameraSource(index, profile)
+            if not source.open():
+                raise RuntimeError(f"camera {index} not working")
+            return source
+        def install(source):
+            old_source, self.frame_source = self.frame_source, source
+            threading.Thread(target=old_source.release, daemon=True).start()
+            print(f"Switched to camera {index}.")
+        self._rebuild_in_background("camera", build, install)
+        
+    def _rebuild_model(self, model_complexity):
+        """Load and warm up the new pose model while the current one keeps running"""
+        def build():
+            pose = self.mp_pose.Pose(model_complexity=model_complexity, 
+                                     min_detection_confidence=0.5, min_tracking_confidence=0.5)
+            pose.process(np.zeros((256, 256, 3), dtype=np.uint8))
+            return pose
+        def install(pose):
+            self.governor = self.create_governor()
+            old_pose = self.poses.pop(model_complexity, None)
+            if old_pose is not None:
+                old_pose.close()
+            self.poses[model_complexity] = pose
+            self.processor = self.create_processor()
+            self.preload_poses()
+            print(f"Pose model complexity {model_complexity} loaded.")
+        if self.worker is not None:
+            # The worker process loads its own model
+            self.governor = self.create_governor()
+            self._rebuild_worker()
+            return
+        self._rebuild_in_background("model", build, install)
+        
+    def _rebuild_worker(self):
+        """Start a pose worker process with the new settings next to the running one"""
+        frame_shape = self.worker.frame_shape
+        settings = self.worker_settings()
+        def build():
+            return PoseWorkerProcess(settings).start(frame_shape)
+        def install(worker):
+            self.worker = worker
+        if frame_shape is not None:
+            self._rebuild_in_background("worker", build, install)
+    
+    def _install_stop_signals(self, stop_requested):
+        """Set stop_requested on Ctrl+C, SIGTERM and Ctrl+Break, returns the previous handlers"""
+        names = ["SIGINT", "SIGTERM", "SIGBREAK"]  # SIGBREAK only exists on Windows
+        previous = {}
+        for name in names:
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            try:
+                previous[signum] = signal.signal(signum, lambda *args: stop_requested.set())
+            except (ValueError, OSError):
+                pass  # Not on the main thread or not supported here
+        return previous
+    
+    def _restore_signals(self, previous):
+        """Put back the handlers replaced by _install_stop_signals"""
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    
+    def probe_camera(self, source):
+        """Find and cache the best capture mode of a camera that has no profile yet"""
+        print(f"Measuring capture modes of camera {source.index}, this only happens once...")
+        profile, _ = CameraProber().probe(source.index, progress=lambda mode: print(f"  {mode}"))
+        if profile is None:
+            return
+        print(f"Using {describe_camera_profile(profile)}")
+        source.profile = profile
+        self.config_store.save_camera_profiles({str(source.index): profile})
+    
     def run(self):
         """Execute main detection loop"""
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+        source = self.frame_source
+        if (isinstance(source, CameraSource) and source.profile is None and not source.is_open() 
+                and self.config.get("camera_probe", True)):
+            self.probe_camera(source)
+        if not source.open():
             print("Error: Camera not working")
             return False
 
-        print("HandySlides started! Press 'q' to exit.")
+        headless = self.config.get("headless", False)
+        if headless:
+            print("HandySlides started without preview! Press Ctrl+C to exit.")
+        else:
+            print("HandySlides started! Press 'q' to exit.")
         print(f"Current configuration:")
         print(f"- Right arm: {self.config['right_arm_action']}")
         print(f"- Left arm: {self.config['left_arm_action']}")
         print(f"- Sensitivity: {self.config['sensitivity']}")
         print(f"- Cooldown: {self.config['cooldown']}s")
 
-        with self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as pose:
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    print("Error capturing frame.")
-                    break
+        renderer = None
+        if headless:
+            # No window and no drawing at all, a signal ends the loop
+            stop_requested = threading.Event()
+            previous_handlers = self._install_stop_signals(stop_requested)
+        else:
+            renderer = self.renderer = PreviewRenderer(self, "HandySlides - Arm Gesture Control", 
+                                                       self.config.get("preview_fps", 15))
+            stop_requested = renderer.stop_requested
+            
+        if self.config.get("hot_reload", True) and self.config_store.config_file:
+            self.config_watcher = ConfigWatcher(self.config_store.config_file).start()
+        if self.config.get("record_landmarks"):
+            self.recorder = LandmarkRecorder(self.config["record_landmarks"]).open()
+        if self.event_bus is None:
+            self.event_bus = create_event_bus(self.config)
 
-                # Mirror frame to be more intuitive
-                if self.config["mirror_camera"]:
-                    frame = cv2.flip(frame, 1)
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = pose.process(frame_rgb)
+        self.start_allocation_count()
+        detect = self._detect_pipelined if self.config.get("inference_process", False) else self._detect_inline
+        if renderer is None:
+            detect(stop_requested, renderer)
+        else:
+            # The preview window needs the main thread, detection moves to a thread of its own
+            def detect_then_stop_preview():
+                try:
+                    detect(stop_requested, renderer)
+                finally:
+                    renderer.stop()
+            detection = threading.Thread(target=detect_then_stop_preview, name="HandySlidesDetection", daemon=True)
+            detection.start()
+            try:
+                renderer.run()
+            except KeyboardInterrupt:
+                pass
+            stop_requested.set()
+            detection.join()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self._finish_rebuilds()
+        # The camera may have been swapped by a settings change
+        source = self.frame_source
 
-                if results.pose_landmarks:
-                    self.mp_drawing.draw_landmarks(frame, results.pose_landmarks, 
-                                                 self.mp_pose.POSE_CONNECTIONS)
-                    
-                    raised_arm = self.is_arm_raised(results.pose_landmarks)
-                    current_time = time.time()
-                    
-                    if raised_arm and (current_time - self.last_press_time > self.config["cooldown"]):
-                        self.execute_action(raised_arm)
-                        self.last_press_time = current_time
-                        self.add_status_text(frame, f"{raised_arm} arm detected!", (0, 255, 0))
-                    elif raised_arm:
-                        # Arm detected but still in cooldown
-                        remaining = self.config["cooldown"] - (current_time - self.last_press_time)
-                        self.add_status_text(frame, f"Cooldown: {remaining:.1f}s", (0, 165, 255))
-                    else:
-                        self.add_status_text(frame, "Ready - Raise your arm", (255, 255, 255))
+        self.close()
+        if renderer is not None:
+            cv2.destroyAllWindows()
+        else:
+            self._restore_signals(previous_handlers)
+        source.release()
+        
+        if self.config["show_debug"]:
+            counters = ", ".join(f"{name}: {value}" for name, value in source.stats().items())
+            rendered = renderer.frames_rendered if renderer is not None else 0
+            print(f"Frames {counters}, rendered: {rendered}")
+            print(f"Governor: {self.governor.describe()}")
+            if self.motion_gate.enabled:
+                print(f"Motion gate: {self.motion_gate.frames_skipped} of {self.motion_gate.frames_checked} "
+                      f"frames skipped ({self.motion_gate.skipped_fraction():.0%})")
+            allocations = self.allocation_stats(renderer)
+            print(f"Allocations per frame: {allocations['buffer_allocations_per_frame']} frame buffers, "
+                  f"{allocations['gc_runs_per_frame']} GC runs")
+            if self.key_dispatcher is not None and self.key_dispatcher.events_sent:
+                dispatcher = self.key_dispatcher
+                latencies = list(dispatcher.latencies)
+                print(f"Keys sent: {dispatcher.events_sent} ({dispatcher.events_coalesced} coalesced, "
+                      f"{dispatcher.events_dropped} dropped, {dispatcher.events_failed} failed), capture to key p50: "
+                      f"{percentile(latencies, 50):.1f} ms, p95: {percentile(latencies, 95):.1f} ms")
+            if self.debug_log.records_dropped:
+                print(f"Debug records dropped: {self.debug_log.records_dropped}")
+            
+        if self.profiler.enabled:
+            for line in self.profiler.overlay_lines():
+                print(f"[profile] {line}")
+            if self.config.get("trace_file"):
+                self.profiler.export(self.config["trace_file"])
+                print(f"Trace written to {self.config['trace_file']}")
+        return True
 
-                else:
-                    self.add_status_text(frame, "Pose not detected", (0, 0, 255))
-                
-                cv2.imshow("HandySlides - Arm Gesture Control", frame)
+class KeyArbiter:
+    """Merge the key presses of several presenter cameras into one key output.
+    
+    After an accepted press, the same key from any camera and any key from cameras
+    of lower or equal priority are ignored for the arbitration window. Two cameras
+    seeing the same raise only move one slide, while a higher priority presenter
+    can still go the other way.
+    """
+    def __init__(self, key_sink, window=0.5):
+        self.key_sink = key_sink
+        self.window = window
+        self.accepted = {}  # source -> count
+        self.rejected = {}
+        self._last_press = None  # (timestamp, priority, key)
+        self._lock = threading.Lock()
+        
+    def press(self, source, priority, key, timestamp, presses=1):
+        """Send the key unless a recent press wins over it, returns True if it was sent"""
+        with self._lock:
+            if self._last_press is not None:
+                last_time, last_priority, last_key = self._last_press
+                if timestamp - last_time < self.window and (key == last_key or priority <= last_priority):
+                    self.rejected[source] = self.rejected.get(source, 0) + 1
+                    return False
+            self._last_press = (timestamp, priority, key)
+            self.accepted[source] = self.accepted.get(source, 0) + 1
+            # Still under the lock so keys go out in arbitration order
+            self.key_sink.press(key, timestamp, presses)
+        return True
 
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
+class ArbitratedKeySink:
+    """Key sink of one presenter camera, forwards to the shared KeyArbiter"""
+    def __init__(self, arbiter, source, priority=0):
+        self.arbiter = arbiter
+        self.source = source
+        self.priority = priority
+        
+    def press(self, key, timestamp=None, presses=1):
+        """Returns False when the arbiter dropped the press"""
+        return self.arbiter.press(self.source, self.priority, key, 
+                                  timestamp if timestamp is not None else time.time(), presses)
 
-        cap.release()
-        cv2.destroyAllWindows()
+class MultiPresenterSession:
+    """Several cameras, each with its own capture thread and pose worker process, sharing one key output"""
+    def __init__(self, config, key_sink=None, report_interval=5.0):
+        self.config = config.settings
+        self.report_interval = report_interval
+        self.debug_log = DebugLog(to_console=self.config["show_debug"], 
+                                  log_file=self.config.get("debug_log_file", ""), 
+                                  sample_every=self.config.get("debug_sample_every", 30))
+        if key_sink is None:
+            key_sink = create_key_sink(self.config.get("key_output", "pyautogui"))
+        # One dispatcher behind the arbiter, the cameras do not get their own
+        self.key_dispatcher = KeyDispatcher(key_sink).start()
+        self.arbiter = KeyArbiter(self.key_dispatcher, self.config.get("arbitration_window", 0.5))
+        # One event bus for all cameras, events say which camera they came from
+        self.event_bus = create_event_bus(self.config)
+        self.streams = []  # (name, HandySlides)
+        for camera in self.config["cameras"]:
+            index = camera["index"]
+            name = f"camera {index}"
+            # Each camera gets its own settings, cooldown included
+            settings = dict(self.config, camera_index=index, async_keys=False, 
+                            cooldown=camera.get("cooldown", self.config["cooldown"]))
+            source = CameraSource(index, self.config.get("camera_profiles", {}).get(str(index)))
+            key_sink = ArbitratedKeySink(self.arbiter, name, camera.get("priority", 0))
+            handyslides = HandySlides(HandySlidesConfig(config.config_file, settings), frame_source=source, 
+                                      key_sink=key_sink, debug_log=self.debug_log, event_bus=self.event_bus)
+            self.streams.append((name, handyslides))
+            
+    def report(self, previous_counts, elapsed):
+        """Print the frame rate of every camera since the last report, returns the new counts"""
+        counts = {}
+        for name, handyslides in self.streams:
+            counts[name] = handyslides.frames_published
+            fps = (counts[name] - previous_counts.get(name, 0)) / elapsed if elapsed > 0 else 0.0
+            stats = ", ".join(f"{key}: {value}" for key, value in handyslides.frame_source.stats().items())
+            print(f"[{name}] {fps:.1f} fps ({stats}), keys sent: {self.arbiter.accepted.get(name, 0)}, "
+                  f"overruled: {self.arbiter.rejected.get(name, 0)}")
+        return counts
+        
+    def run(self):
+        """Run all cameras until Ctrl+C or a termination signal"""
+        self.debug_log.start()
+        stop_requested = threading.Event()
+        previous_handlers = self.streams[0][1]._install_stop_signals(stop_requested)
+        
+        threads = []
+        for name, handyslides in self.streams:
+            if not handyslides.frame_source.open():
+                print(f"Error: {name} not working")
+                continue
+            # Inference runs in one worker process per camera, spread over the cores
+            thread = threading.Thread(target=handyslides._detect_pipelined, name=f"HandySlides {name}", 
+                                      args=(stop_requested, None), daemon=True)
+            thread.start()
+            threads.append(thread)
+        if not threads:
+            if self.event_bus is not None:
+                self.event_bus.close()
+            self._restore(previous_handlers)
+            return False
+            
+        print(f"HandySlides started with {len(threads)} cameras! Press Ctrl+C to exit.")
+        counts = {}
+        last_report = time.perf_counter()
+        while not stop_requested.wait(self.report_interval):
+            if not any(thread.is_alive() for thread in threads):
+                break
+            now = time.perf_counter()
+            counts = self.report(counts, now - last_report)
+            last_report = now
+            
+        stop_requested.set()
+        for thread in threads:
+            thread.join(timeout=10.0)
+        for name, handyslides in self.streams:
+            handyslides.frame_source.release()
+            handyslides.close()
+        self.key_dispatcher.close()
+        if self.event_bus is not None:
+            self.event_bus.close()
+            stats = self.event_bus.stats()
+            print(f"Events published: {stats['published']}, dropped: {stats['dropped']}")
+        self.debug_log.close()
+        self._restore(previous_handlers)
+        self.report(counts, time.perf_counter() - last_report)
         return True
+        
+    def _restore(self, previous_handlers):
+        self.streams[0][1]._restore_signals(previous_handlers)
+
+def probe_cameras(config):
+    """Probe every connected camera, print the modes and cache the best one per camera"""
+    prober = CameraProber()
+    profiles = {}
+    for index in prober.list_devices():
+        print(f"Camera {index}:")
+        best, results = prober.probe(index)
+        for profile in results:
+            print(f"  {describe_camera_profile(profile)}")
+        if best is not None:
+            print(f"  -> best: {describe_camera_profile(best)}")
+            profiles[str(index)] = best
+    config.save_camera_profiles(profiles)
+
+def is_multi_camera(settings):
+    """True when the settings describe a multi-presenter session"""
+    return len(settings.get("cameras", [])) >= 2
+
+def start_pose_loader(settings):
+    """Start warming up the pose model, unless inference will not happen in this process"""
+    if settings.get("inference_process", False) or is_multi_camera(settings):
+        return None
+    return PoseModelLoader(settings.get("model_complexity", 1)).start()
+
+def run_detection(config, pose_loader=None, frame_source=None):
+    """Run a single camera or a multi-presenter session, depending on the settings"""
+    if is_multi_camera(config.settings):
+        if frame_source is not None:
+            frame_source.release()
+        return MultiPresenterSession(config).run()
+    return HandySlides(config, frame_source=frame_source, pose_loader=pose_loader).run()
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="HandySlides - Slide Control by Gestures")
+    parser.add_argument("--headless", action="store_true", 
+                        help="skip the configuration window and run without preview, e.g. as a service")
+    parser.add_argument("--probe-camera", action="store_true", 
+                        help="measure the capture modes of all cameras again and cache the best ones")
+    parser.add_argument("--cameras", 
+                        help="comma separated camera indexes for multi-presenter mode, first has priority")
+    parser.add_argument("--record-landmarks", metavar="FILE", 
+                        help="append the detected landmarks to FILE for replay_landmarks.py")
+    args = parser.parse_args()
+    
     print("=== HandySlides - Slide Control by Gestures ===")
     
-    # Show configuration window
+    if args.probe_camera:
+        probe_cameras(HandySlidesConfig())
+        return
+    
+    if args.cameras:
+        config = HandySlidesConfig()
+        try:
+            indexes = [int(index) for index in args.cameras.split(",")]
+        except ValueError:
+            parser.error(f"--cameras needs comma separated camera indexes, got {args.cameras!r}")
+        if len(indexes) == 1:
+            # A single camera is the usual one-presenter mode on that camera
+            config.settings["camera_index"] = indexes[0]
+            config.settings["cameras"] = []
+        else:
+            config.settings["cameras"] = [{"index": index, "priority": len(indexes) - position} 
+                                          for position, index in enumerate(indexes)]
+        run_detection(config)
+        return
+    
+    if args.headless:
+        config = HandySlidesConfig()
+        config.settings["headless"] = True
+        if args.record_landmarks:
+            config.settings["record_landmarks"] = args.record_landmarks
+        run_detection(config, start_pose_loader(config.settings))
+        return
+    
+    # Show configuration window, the pose model loads in the meantime
     config_window = ConfigWindow()
+    loader = start_pose_loader(config_window.config.settings)
+    config_window.pose_loader = loader
     config_window.root.mainloop()
     
     # If window was closed without starting, exit
@@ -596,8 +3812,11 @@ def main():
         pass  # Window was destroyed, continue
     
     # Start detection
-    handyslides = HandySlides(config_window.config)
-    handyslides.run()
+    if args.record_landmarks:
+        config_window.config.settings["record_landmarks"] = args.record_landmarks
+    run_detection(config_window.config, loader, config_window.camera_source)
 
 if __name__ == "__main__":
+    # Needed for the pose worker process in the packaged executable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,171 @@
+"""Turn recorded talks into slide-change timelines, using all CPU cores.
+
+Every video is cut into segments that are detected in parallel worker processes.
+Each segment starts a few seconds early, so pose tracking and the gesture rules
+have warmed up when its own part begins:
+
+    python batch_timeline.py talk.mp4 other.mp4 --segment 60 --warmup 3
+    python batch_timeline.py talk.mp4 --format csv --output-dir timelines/
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import parse_overrides
+from HandySlides import HandySlides, HandySlidesConfig, RecordingKeySink, cv2, validate_settings
+
+def video_info(path):
+    """(frame count, frames per second) of a video, None if it cannot be opened.
+    
+    The frame count comes from the container and is only an estimate.
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), fps
+    finally:
+        cap.release()
+
+def plan_segments(frame_count, fps, segment, warmup):
+    """Split a video into (warm-up start, start, end) frame ranges, end exclusive.
+    
+    The last segment has no end and reads until the video ends, as the frame
+    count may be short.
+    """
+    length = max(1, round(segment * fps))
+    warmup_frames = round(warmup * fps)
+    starts = range(0, frame_count, length)
+    return [(max(0, start - warmup_frames), start, start + length if start + length < frame_count else None)
+            for start in starts]
+
+def detect_segment(path, fps, warm_start, start, end, settings):
+    """Run detection on frames warm_start..end of a video (to its end if end is None), in a worker process.
+
+    Returns the key presses within start..end as (time, key) and the number of
+    frames decoded. Every segment gets a fresh pose model, so the result does
+    not depend on which segments a worker ran before.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return [], 0
+    if warm_start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, warm_start)
+
+    key_sink = RecordingKeySink()
+    handyslides = HandySlides(HandySlidesConfig(None, dict(settings)), key_sink=key_sink)
+    processor = handyslides.create_processor()
+    frame, frames, index = None, 0, warm_start
+    try:
+        while end is None or index < end:
+            ret, frame = cap.read(frame)
+            if not ret:
+                break
+            # Timestamps from the frame number, container timestamps can jump after seeking
+            handyslides.process_frame(processor, frame, index / fps)
+            frames += 1
+            index += 1
+    finally:
+        handyslides.close()
+        cap.release()
+    begin = start / fps
+    return [(t, key) for t, key in key_sink.events if t >= begin], frames
+
+def stitch(segment_events, cooldown, merge_window):
+    """Merge the key presses of consecutive segments into one timeline.
+
+    The cooldown is applied again over the whole video, since segments only saw
+    their own presses. The same key pressed by two segments within merge_window
+    seconds is one gesture that straddles the boundary.
+    """
+    timeline, last_time, last_by_key = [], None, {}
+    events = sorted((t, key, segment) for segment, presses in enumerate(segment_events) for t, key in presses)
+    for t, key, segment in events:
+        if last_time is not None and t - last_time < cooldown:
+            continue
+        previous = last_by_key.get(key)
+        if previous is not None and previous[1] != segment and t - previous[0] < merge_window:
+            continue
+        timeline.append({"time": round(t, 3), "key": key})
+        last_time = t
+        last_by_key[key] = (t, segment)
+    return timeline
+
+def write_timeline(path, timeline, output_format):
+    """Write a timeline as JSON or CSV"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if output_format == "csv":
+            writer = csv.writer(f)
+            writer.writerow(["time", "key"])
+            writer.writerows([event["time"], event["key"]] for event in timeline)
+        else:
+            json.dump(timeline, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect slide changes in recorded talks")
+    parser.add_argument("videos", nargs="+", help="video files")
+    parser.add_argument("--config", default="handyslides_config.json", help="settings file to start from")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a setting")
+    parser.add_argument("--segment", type=float, default=60.0, help="seconds of video per task")
+    parser.add_argument("--warmup", type=float, default=3.0,
+                        help="seconds decoded before each segment, at least the longest gesture hold")
+    parser.add_argument("--merge-window", type=float, default=0.5,
+                        help="same-key presses this close across a segment boundary count once")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--format", choices=("json", "csv"), default="json", help="timeline file format")
+    parser.add_argument("--output-dir", default=".", help="where to write <video>.timeline.json/csv")
+    args = parser.parse_args()
+
+    settings = dict(HandySlidesConfig(args.config).settings)
+    # Every frame is inferred and output is quiet, so the timeline does not depend on machine load
+    settings.update(show_debug=False, async_keys=False, profile=False, governor=False, motion_gate=False,
+                    debug_log_file="", trace_file="", record_landmarks="", hot_reload=False)
+    settings.update(parse_overrides(args.set))
+    errors = validate_settings(settings)
+    if errors:
+        parser.error("; ".join(errors))
+
+    jobs = []
+    for path in args.videos:
+        info = video_info(path)
+        if info is None:
+            print(f"Error: cannot open {path}")
+            continue
+        frame_count, fps = info
+        if frame_count <= 0:
+            # Streamed or remuxed files may not know their length, it cannot be split then
+            print(f"Error: {path} does not report its frame count, remux it (e.g. ffmpeg -i in -c copy out.mp4)")
+            continue
+        jobs.append((path, fps, plan_segments(frame_count, fps, args.segment, args.warmup)))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    start = time.perf_counter()
+    total_frames = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        # Submit everything first, so segments of all videos share the workers
+        futures = [(path, fps, [pool.submit(detect_segment, path, fps, *segment, settings) for segment in segments])
+                   for path, fps, segments in jobs]
+        for path, fps, segment_futures in futures:
+            results = [future.result() for future in segment_futures]
+            frames = sum(decoded for _, decoded in results)
+            total_frames += frames
+            timeline = stitch([events for events, _ in results], settings["cooldown"], args.merge_window)
+
+            name = os.path.splitext(os.path.basename(path))[0]
+            output = os.path.join(args.output_dir, f"{name}.timeline.{args.format}")
+            write_timeline(output, timeline, args.format)
+            print(f"{path}: {len(timeline)} slide changes in {len(segment_futures)} segments, "
+                  f"{frames} frames decoded, written to {output}")
+
+    elapsed = time.perf_counter() - start
+    fps = total_frames / elapsed if elapsed > 0 else 0.0
+    print(f"{total_frames} frames in {elapsed:.1f}s ({fps:.1f} fps with {args.workers} workers)")
+    return 0 if len(jobs) == len(args.videos) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
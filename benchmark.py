@@ -0,0 +1,126 @@
+"""Replay recorded presentations through the HandySlides pipeline as fast as possible.
+
+Usage:
+    python benchmark.py talk.mp4 [more videos or image directories]
+    python benchmark.py talk.mp4 --set inference_width=0 --set roi_tracking=false --json result.json
+"""
+import argparse
+import json
+import time
+
+from HandySlides import (HandySlides, HandySlidesConfig, RecordingKeySink,
+                         open_frame_source, percentile)
+
+def parse_overrides(pairs):
+    """Turn key=value arguments into settings, values are parsed as JSON when possible"""
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    return overrides
+
+def benchmark_source(spec, config):
+    """Run every frame of one source through detection and collect timings"""
+    source = open_frame_source(spec)
+    if not source.open():
+        print(f"Error: cannot open {spec}")
+        return None
+
+    key_sink = RecordingKeySink()
+    handyslides = HandySlides(config, frame_source=source, key_sink=key_sink)
+    latencies = []
+
+    handyslides.processor = handyslides.create_processor()
+    handyslides.preload_poses()
+    handyslides.start_allocation_count()
+    start = time.perf_counter()
+    while True:
+        frame_start = time.perf_counter()
+        # Pose models the governor switches to are installed between frames, as live
+        handyslides.apply_config_changes()
+        processor = handyslides.processor
+        ret, frame, timestamp = source.read()
+        if not ret:
+            break
+        handyslides.process_frame(processor, frame, timestamp)
+        handyslides.frames_published += 1
+        handyslides.profiler.tick()
+        latencies.append((time.perf_counter() - frame_start) * 1000.0)
+    elapsed = time.perf_counter() - start
+
+    handyslides._finish_rebuilds()
+    handyslides.close()
+    source.release()
+
+    report = {
+        "source": str(spec),
+        "frames": len(latencies),
+        "seconds": round(elapsed, 3),
+        "fps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p90": round(percentile(latencies, 90), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies, default=0.0), 2)
+        },
+        "governor": handyslides.governor.describe(),
+        "motion_skipped": round(handyslides.motion_gate.skipped_fraction(), 4),
+        "allocations": handyslides.allocation_stats(),
+        "gestures": [{"time": round(t, 3), "key": key} for t, key in key_sink.events]
+    }
+    if handyslides.profiler.enabled:
+        report["stages_ms"] = {name: {"p50": round(p50, 3), "p95": round(p95, 3)} 
+                               for name, (p50, p95) in handyslides.profiler.summary().items()}
+    return report
+
+def print_report(report):
+    """Print one source's results in a readable form"""
+    latency = report["latency_ms"]
+    print(f"{report['source']}: {report['frames']} frames in {report['seconds']}s "
+          f"({report['fps']} fps)")
+    print(f"  latency ms - p50: {latency['p50']}, p90: {latency['p90']}, "
+          f"p99: {latency['p99']}, max: {latency['max']}")
+    print(f"  governor: {report['governor']}")
+    print(f"  motion gate: {report['motion_skipped']:.0%} of frames skipped")
+    print(f"  allocations per frame: {report['allocations']['buffer_allocations_per_frame']} frame buffers, "
+          f"{report['allocations']['gc_runs_per_frame']} GC runs")
+    for name, stage in report.get("stages_ms", {}).items():
+        print(f"  {name}: p50 {stage['p50']} ms, p95 {stage['p95']} ms")
+    print(f"  gestures: {len(report['gestures'])}")
+    for gesture in report["gestures"]:
+        print(f"    {gesture['time']:9.3f}s  {gesture['key']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="HandySlides offline benchmark")
+    parser.add_argument("sources", nargs="+", help="video files, image directories or camera indexes")
+    parser.add_argument("--config", default="handyslides_config.json", help="settings file to start from")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a setting for this run")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    config = HandySlidesConfig(args.config)
+    # Per-frame debug prints would dominate the timings
+    config.settings["show_debug"] = False
+    # Keys are only recorded, inline recording keeps the timeline exact
+    config.settings["async_keys"] = False
+    config.settings.update(parse_overrides(args.set))
+
+    reports = []
+    for spec in args.sources:
+        report = benchmark_source(spec, config)
+        if report is not None:
+            print_report(report)
+            reports.append(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"settings": config.settings, "results": reports}, f, indent=2)
+
+    return 0 if len(reports) == len(args.sources) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
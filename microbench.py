@@ -0,0 +1,176 @@
+"""Time the per-frame hot paths of HandySlides on synthetic frames and landmarks.
+
+Pose inference and key presses are stubbed out, so it runs headless without a
+camera or MediaPipe model. Save a baseline once per machine, later runs fail
+when a hot path got slower than the tolerance allows or has no baseline:
+
+    python microbench.py --save
+    python microbench.py --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from types import SimpleNamespace
+
+import numpy as np
+
+from HandySlides import (HandySlides, HandySlidesConfig, LandmarkFilter, MotionGate, NullKeySink,
+                         RoiPoseProcessor, cv2, landmarks_to_array, mirror_landmarks)
+
+RESOLUTIONS = {
+    "480p": (480, 640),
+    "720p": (720, 1280),
+    "1080p": (1080, 1920),
+    "4k": (2160, 3840)
+}
+
+class SyntheticLandmark:
+    def __init__(self, x, y, z=0.0, visibility=0.9):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+class SyntheticLandmarks:
+    """Stand-in for MediaPipe's NormalizedLandmarkList: a standing presenter, arms down"""
+    def __init__(self):
+        self.landmark = [SyntheticLandmark(0.4 + 0.01 * (i % 20), 0.3 + 0.01 * i) for i in range(33)]
+        for shoulder in (11, 12):
+            self.landmark[shoulder].y = 0.4
+        for wrist in (15, 16):
+            self.landmark[wrist].y = 0.6
+
+class StubPose:
+    """Pose model that finds nothing, so only the preprocessing around it is timed"""
+    def process(self, image):
+        return SimpleNamespace(pose_landmarks=None)
+
+def gesture_frames():
+    """Landmark arrays cycling through arms down, left raised and both raised"""
+    frames = []
+    for left, right in ((0.6, 0.6), (0.2, 0.6), (0.2, 0.2)):
+        array = landmarks_to_array(SyntheticLandmarks())
+        array[15, 1], array[16, 1] = left, right
+        frames.append(array)
+    return frames
+
+def build_cases(resolutions):
+    """Name -> function to time"""
+    settings = dict(HandySlidesConfig(None).settings, show_debug=False, async_keys=False, profile=False)
+    handyslides = HandySlides(HandySlidesConfig(None, settings), key_sink=NullKeySink())
+    landmarks = SyntheticLandmarks()
+    frames = gesture_frames()
+    landmark_filter = LandmarkFilter()
+    clock = iter(range(1, 1 << 62))
+    rule = handyslides.gestures.rules[0]
+
+    def update_gestures():
+        index = next(clock)
+        handyslides.update_gestures(index / 30.0, frames[index // 10 % len(frames)])
+
+    def smoothing():
+        index = next(clock)
+        landmark_filter.filter(frames[index // 10 % len(frames)], index / 30.0)
+
+    cases = {
+        "landmarks_to_array": lambda: landmarks_to_array(landmarks, out=handyslides._landmark_array),
+        "mirror_landmarks": lambda: mirror_landmarks(landmarks),
+        "smoothing": smoothing,
+        "update_gestures": update_gestures,
+        "execute_action": lambda: handyslides.execute_action(rule),
+    }
+
+    rng = np.random.default_rng(0)
+    for name in resolutions:
+        height, width = RESOLUTIONS[name]
+        frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        display = np.empty_like(frame)
+        processor = RoiPoseProcessor(StubPose(), working_width=settings["inference_width"], roi_tracking=False)
+        gate = MotionGate(static_interval=1e9)
+        gate.should_infer(frame, 0.0, True)  # Reference image, later frames are static
+
+        cases[f"preprocess@{name}"] = lambda processor=processor, frame=frame: processor.process(frame)
+        cases[f"flip@{name}"] = lambda frame=frame, display=display: cv2.flip(frame, 1, dst=display)
+        cases[f"status_text@{name}"] = lambda frame=display: handyslides.add_status_text(
+            frame, "Ready - Raise your arm", (255, 255, 255))
+        cases[f"motion_gate@{name}"] = lambda gate=gate, frame=frame: gate.should_infer(frame, 1.0, True)
+    return handyslides, cases
+
+def time_case(function, repeats=7):
+    """Best time of one call in microseconds, over repeats runs of about 0.2 s"""
+    function()  # Warm up, reused buffers are allocated here
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeats, number)) / number * 1e6
+
+def compare(results, baseline, tolerance):
+    """Print the results next to the baseline, returns the names of regressed cases"""
+    regressed = []
+    print(f"{'case':28} {'us/call':>10} {'baseline':>10} {'change':>8}")
+    for name, microseconds in results.items():
+        reference = baseline.get(name)
+        if reference:
+            change = microseconds / reference - 1.0
+            flag = "  REGRESSED" if change > tolerance else ""
+            if flag:
+                regressed.append(name)
+            print(f"{name:28} {microseconds:10.2f} {reference:10.2f} {change:+8.0%}{flag}")
+        else:
+            print(f"{name:28} {microseconds:10.2f} {'-':>10} {'':>8}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="HandySlides hot path microbenchmarks")
+    parser.add_argument("--baseline", default="microbench_baseline.json", help="baseline timings file")
+    parser.add_argument("--save", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, 0.25 is 25%%")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS),
+                        help="comma separated frame sizes out of " + ", ".join(RESOLUTIONS))
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    args = parser.parse_args()
+
+    resolutions = [name for name in args.resolutions.split(",") if name]
+    unknown = [name for name in resolutions if name not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"unknown resolutions: {', '.join(unknown)}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get("cases", {})
+    elif not args.save:
+        # Timings depend on the machine, so there is no shared baseline to fall back to
+        parser.error(f"no baseline at {args.baseline}, create one on this machine with --save")
+
+    handyslides, cases = build_cases(resolutions)
+    results = {}
+    for name, function in cases.items():
+        if args.filter in name:
+            results[name] = round(time_case(function), 3)
+    handyslides.close()
+
+    regressed = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"machine": platform.platform(), "python": sys.version.split()[0],
+                       "opencv": cv2.__version__, "numpy": np.__version__,
+                       "cases": dict(baseline, **results)}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        print(f"{len(missing)} cases have no baseline, add them with --save: {', '.join(missing)}")
+        return 1
+    if regressed:
+        print(f"{len(regressed)} hot paths slower than the baseline by more than {args.tolerance:.0%}: "
+              f"{', '.join(regressed)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
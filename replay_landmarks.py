@@ -0,0 +1,107 @@
+"""Replay landmark recordings through the HandySlides gesture and cooldown logic.
+
+Record with:
+    python HandySlides.py --record-landmarks talk.hslm
+
+Then try settings without a camera or MediaPipe inference:
+    python replay_landmarks.py talk.hslm
+    python replay_landmarks.py talk.hslm other.hslm --sweep sensitivity=0.03,0.05,0.08 --sweep cooldown=0,1
+"""
+import argparse
+import itertools
+import json
+import time
+
+import numpy as np
+
+from benchmark import parse_overrides
+from HandySlides import (RECORDING_SESSION_START, HandySlides, HandySlidesConfig, RecordingKeySink,
+                         read_landmark_recording, validate_settings)
+
+def parse_sweeps(pairs):
+    """Turn key=v1,v2,... arguments into a list of settings for every combination"""
+    names, choices = [], []
+    for pair in pairs:
+        key, _, values = pair.partition("=")
+        names.append(key)
+        choices.append([parse_overrides([f"{key}={value}"])[key] for value in values.split(",")])
+    return [dict(zip(names, combination)) for combination in itertools.product(*choices)]
+
+def split_sessions(recording, max_gap=10.0):
+    """Split a file into its recording sessions, each is replayed from a fresh gesture state.
+    
+    Sessions begin at session start records. Older recordings have none, there a
+    clock going backwards or a gap of more than max_gap seconds starts a session.
+    """
+    times = recording["time"]
+    markers = recording["present"] == RECORDING_SESSION_START
+    gaps = np.diff(times)
+    starts = np.flatnonzero(markers[1:] | (gaps < 0) | (gaps > max_gap)) + 1
+    bounds = [0] + starts.tolist() + [len(recording)]
+    sessions = []
+    for begin, end in zip(bounds, bounds[1:]):
+        session = recording[begin:end]
+        if len(session) and session["present"][0] == RECORDING_SESSION_START:
+            session = session[1:]
+        if len(session):
+            sessions.append(session)
+    return sessions
+
+def replay(recording, settings):
+    """Feed every recorded frame to the gesture logic, returns the key presses and the time it took"""
+    events, elapsed = [], 0.0
+    for session in split_sessions(recording):
+        key_sink = RecordingKeySink()
+        handyslides = HandySlides(HandySlidesConfig(None, dict(settings)), key_sink=key_sink)
+        start = time.perf_counter()
+        handyslides.replay(session["time"], session["landmarks"], session["present"].astype(bool))
+        elapsed += time.perf_counter() - start
+        handyslides.close()
+        events += key_sink.events
+    return events, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay HandySlides landmark recordings")
+    parser.add_argument("recordings", nargs="+", help="files written with --record-landmarks")
+    parser.add_argument("--config", default="handyslides_config.json", help="settings file to start from")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a setting for every run")
+    parser.add_argument("--sweep", action="append", default=[], metavar="KEY=V1,V2,...",
+                        help="run once per value, several sweeps run every combination")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    base = dict(HandySlidesConfig(args.config).settings)
+    # Console output and the key dispatcher thread would dominate the timings
+    base.update(show_debug=False, async_keys=False, debug_log_file="", record_landmarks="")
+    base.update(parse_overrides(args.set))
+
+    recordings = [(path, read_landmark_recording(path)) for path in args.recordings]
+    results = []
+    for overrides in parse_sweeps(args.sweep):
+        settings = dict(base, **overrides)
+        errors = validate_settings(settings)
+        if errors:
+            print(f"{overrides}: skipped, {'; '.join(errors)}")
+            continue
+        for path, recording in recordings:
+            events, elapsed = replay(recording, settings)
+            duration = sum(float(session["time"][-1] - session["time"][0]) for session in split_sessions(recording))
+            speedup = duration / elapsed if elapsed > 0 else 0.0
+            keys = {}
+            for _, key in events:
+                keys[key] = keys.get(key, 0) + 1
+            label = ", ".join(f"{name}={value}" for name, value in overrides.items()) or "settings"
+            print(f"{path} [{label}]: {len(events)} keys {keys}, {len(recording)} frames "
+                  f"in {elapsed * 1000:.0f} ms ({speedup:.0f}x real time)")
+            results.append({"recording": path, "settings": overrides, "frames": len(recording),
+                            "seconds": round(elapsed, 4), "speedup": round(speedup, 1), "keys": keys,
+                            "presses": [{"time": round(t, 3), "key": key} for t, key in events]})
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"settings": base, "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HandySlides import HandySlides, HandySlidesConfig, RecordingKeySink  # noqa: E402
+
+FPS = 30.0
+
+def pose_array(left_wrist=0.6, right_wrist=0.6, shoulder=0.4, left_x=0.35, right_x=0.65):
+    """A (33, 4) landmark array of a standing presenter, wrist heights in image units (0 is the top)"""
+    array = np.zeros((33, 4), dtype=np.float32)
+    array[:, 0] = 0.5
+    array[:, 1] = 0.5
+    array[:, 3] = 1.0
+    array[[11, 12], 1] = shoulder
+    array[[11, 15], 0] = left_x
+    array[[12, 16], 0] = right_x
+    array[15, 1] = left_wrist
+    array[16, 1] = right_wrist
+    return array
+
+def sequence(*steps):
+    """Frames at FPS from (seconds, left wrist, right wrist) steps, a None wrist means no pose.
+
+    Returns times, landmarks and present arrays like a landmark recording.
+    """
+    times, landmarks, present = [], [], []
+    for seconds, left, right in steps:
+        for _ in range(round(seconds * FPS)):
+            times.append(len(times) / FPS)
+            found = left is not None and right is not None
+            landmarks.append(pose_array(left, right) if found else np.zeros((33, 4), dtype=np.float32))
+            present.append(found)
+    return np.array(times), np.array(landmarks), np.array(present)
+
+@pytest.fixture
+def make_handyslides():
+    """Build HandySlides instances that record key presses, closed after the test"""
+    created = []
+
+    def make(key_sink=None, **settings):
+        base = dict(HandySlidesConfig(None).settings, show_debug=False, async_keys=False, hot_reload=False,
+                    debug_log_file="")
+        base.update(settings)
+        key_sink = key_sink if key_sink is not None else RecordingKeySink()
+        handyslides = HandySlides(HandySlidesConfig(None, base), key_sink=key_sink)
+        created.append(handyslides)
+        return handyslides
+
+    yield make
+    for handyslides in created:
+        handyslides.close()
+
+def run_live(handyslides, times, landmarks, present):
+    """Feed frames one by one like the detection loop, returns the recorded (time, key) presses"""
+    for timestamp, array, found in zip(times, landmarks, present):
+        handyslides.handle_landmarks(None, float(timestamp), array.copy() if found else None)
+    return handyslides.key_sink.events
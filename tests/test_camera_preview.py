@@ -0,0 +1,72 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from HandySlides import CameraPreview
+
+class StallingSource:
+    """Camera stand-in whose reads can be made to hang, like a camera that stops delivering"""
+    def __init__(self):
+        self.stalled = threading.Event()
+        self.unstall = threading.Event()
+        self.reading = threading.Event()
+        self.released = False
+
+    def open(self):
+        return True
+
+    def read(self):
+        if self.stalled.is_set():
+            self.reading.set()
+            self.unstall.wait(5.0)
+        time.sleep(0.01)
+        return True, np.zeros((240, 320, 3), dtype=np.uint8), time.time()
+
+    def release(self):
+        self.released = True
+
+class CountingPose:
+    """Pose model stand-in that counts its inferences and finds nobody"""
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, image):
+        self.calls += 1
+        return SimpleNamespace(pose_landmarks=None)
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_preview_hands_over_the_camera_once_finished():
+    source = StallingSource()
+    preview = CameraPreview(source, max_fps=50).start()
+    assert wait_until(lambda: preview.take_thumbnail() is not None)
+    preview.request_stop()
+    assert wait_until(preview.finished)
+    assert preview.detach() is source and not source.released
+
+def test_stalled_preview_leaves_the_pose_model_to_detection():
+    pose = CountingPose()
+    loader = SimpleNamespace(pose=pose, ready=lambda: True)
+    source = StallingSource()
+    preview = CameraPreview(source, loader, max_fps=50).start()
+    assert wait_until(lambda: pose.calls > 0)
+    source.stalled.set()
+    assert source.reading.wait(5.0)
+
+    preview.request_stop()
+    # Gave up waiting for the preview, detection takes the pose model over
+    assert preview.detach() is None
+    calls = pose.calls
+    source.unstall.set()
+    assert wait_until(preview.finished)
+    assert pose.calls == calls
+    # The preview closes the camera it kept
+    assert source.released
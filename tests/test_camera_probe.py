@@ -0,0 +1,51 @@
+import time
+
+import cv2
+import numpy as np
+
+from HandySlides import CameraProber
+
+class SlowCapture:
+    """Camera stand-in that delivers 640x480 frames at a fixed rate"""
+    def __init__(self, index, backend=None, fps=5.0):
+        self.interval = 1.0 / fps
+        self.size = (640, 480)
+        self.requested = {}
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        self.requested[prop] = value
+        return True
+
+    def get(self, prop):
+        # The only mode it has, whatever was requested
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.size[0]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.size[1]
+        if prop == cv2.CAP_PROP_FOURCC:
+            return self.requested.get(prop, 0)
+        return 0
+
+    def read(self):
+        time.sleep(self.interval)
+        return True, np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+def test_slow_mode_is_measured_for_a_bounded_time(monkeypatch):
+    monkeypatch.setattr(cv2, "VideoCapture", SlowCapture)
+    prober = CameraProber(measure_time=0.5)
+    start = time.perf_counter()
+    profile = prober._measure(0, "ANY", "YUYV", 640, 480)
+    elapsed = time.perf_counter() - start
+    # 35 frames at 5 fps used to take 7 s
+    assert elapsed < 1.5
+    assert profile["fourcc"] == "YUYV" and profile["measured_fps"] < 6.0
+
+def test_modes_the_camera_does_not_have_are_skipped(monkeypatch):
+    monkeypatch.setattr(cv2, "VideoCapture", SlowCapture)
+    assert CameraProber(measure_time=0.1)._measure(0, "ANY", "MJPG", 1920, 1080) is None
@@ -0,0 +1,68 @@
+import json
+import socket
+import time
+
+import pytest
+
+from HandySlides import EventBus, EventSubscriber, create_event_bus
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+@pytest.fixture
+def bus():
+    bus = EventBus("tcp:0", queue_size=4, accept_interval=0.05).start()
+    yield bus
+    bus.close()
+
+def connect(bus):
+    client = socket.create_connection(bus._server.getsockname(), timeout=5.0)
+    assert wait_until(lambda: bus.stats()["subscribers"] == 1)
+    return client
+
+def test_subscribers_get_every_event_as_a_json_line(bus):
+    client = connect(bus)
+    bus.publish("gesture", 12.5, camera=0, gesture="Right arm", action="next", key="right")
+    bus.publish("cooldown", 12.5, camera=0, seconds=1.0)
+    reader = client.makefile("r", encoding="utf-8")
+    assert json.loads(reader.readline()) == {"type": "gesture", "time": 12.5, "camera": 0, 
+                                             "gesture": "Right arm", "action": "next", "key": "right"}
+    assert json.loads(reader.readline())["type"] == "cooldown"
+    bus.close()
+    # Queued events are sent before disconnecting
+    assert reader.readline() == ""
+    client.close()
+
+def test_full_queue_drops_the_oldest_events():
+    subscriber = EventSubscriber(None, queue_size=3)  # Not started, nothing is sent
+    assert [subscriber.offer(b"%d\n" % i) for i in range(5)] == [True, True, True, False, False]
+    assert list(subscriber._lines) == [b"2\n", b"3\n", b"4\n"]
+
+def test_bus_counts_events_dropped_for_slow_subscribers(bus):
+    slow = EventSubscriber(None, queue_size=2)
+    bus.subscribers.append(slow)
+    for i in range(5):
+        bus.publish("pose", float(i), present=True)
+    assert bus.stats() == {"published": 5, "dropped": 3, "subscribers": 1}
+    bus.subscribers.remove(slow)
+
+def test_departed_subscribers_are_forgotten(bus):
+    client = connect(bus)
+    client.close()
+    # The sender notices once it writes to the closed connection
+    assert wait_until(lambda: bus.publish("pose", 0.0, present=False) or bus.stats()["subscribers"] == 0)
+
+def test_unusable_address_is_reported(tmp_path, capsys):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    assert create_event_bus({"event_bus": f"unix:{path}"}) is None
+    assert create_event_bus({"event_bus": "udp:8765"}) is None
+    output = capsys.readouterr().out
+    assert "is not a socket" in output or "unix sockets are not available" in output
+    assert "must be tcp:PORT or unix:PATH" in output
+    assert path.read_text() == "keep me"
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import numpy as np
+
+from HandySlides import FrameBufferRing, FrameGrabber, PreviewRenderer
+
+class CountingCapture:
+    """Camera stand-in at 60 fps, every frame is filled with its frame number and decoded in place"""
+    def __init__(self, frames=None, interval=1 / 60):
+        self.count = 0
+        self.frames = frames
+        self.interval = interval
+
+    def read(self, buffer=None):
+        time.sleep(self.interval)
+        if self.frames is not None and self.count >= self.frames:
+            return False, None
+        self.count += 1
+        if buffer is None:
+            buffer = np.empty((48, 64, 3), dtype=np.uint8)
+        buffer.fill(self.count % 256)
+        return True, buffer
+
+def test_grabbed_frame_does_not_change_until_the_next_read():
+    grabber = FrameGrabber(CountingCapture()).start()
+    try:
+        for _ in range(5):
+            ok, frame, _ = grabber.read()
+            assert ok
+            value = frame[0, 0, 0]
+            # Several capture intervals, the ring would have wrapped around
+            time.sleep(0.12)
+            assert (frame == value).all()
+        assert grabber.frames_dropped > 0
+        assert grabber.ring.allocations == 3
+    finally:
+        grabber.stop()
+
+def test_ring_reuses_only_released_buffers():
+    ring = FrameBufferRing(2)
+    capture = CountingCapture(interval=0)
+    _, first, first_slot = ring.read(capture)
+    _, second, second_slot = ring.read(capture)
+    # Nothing released, so the next frame gets an array of its own
+    _, third, third_slot = ring.read(capture)
+    assert third_slot is None and third is not first and third is not second
+    assert (first == 1).all() and (second == 2).all()
+    ring.release(first_slot)
+    _, fourth, _ = ring.read(capture)
+    assert fourth is first and (second == 2).all()
+
+def test_preview_keeps_its_own_copy_of_a_submitted_frame():
+    renderer = PreviewRenderer(None, "test")
+    frame = np.full((48, 64, 3), 1, dtype=np.uint8)
+    renderer.submit(frame, None, "", (0, 0, 0))
+    frame.fill(6)
+    assert (renderer._pending[0] == 1).all()
+
+def test_stopped_stream_ends_reads():
+    grabber = FrameGrabber(CountingCapture(frames=3, interval=0)).start()
+    reader = threading.Thread(target=lambda: [grabber.read() for _ in range(10)])
+    reader.start()
+    reader.join(timeout=5.0)
+    assert not reader.is_alive()
+    grabber.stop()
@@ -0,0 +1,72 @@
+from conftest import run_live, sequence
+
+from HandySlides import GestureStateMachine, create_gesture_rules
+
+def feed(machine, frames):
+    """Feed (above_raise, below_release) frames, returns the indexes of frames that fired"""
+    return [i for i, (above, below) in enumerate(frames) if machine.update(above, below)]
+
+UP, MIDDLE, DOWN = (True, False), (False, False), (False, True)
+
+def test_state_machine_fires_once_per_raise():
+    machine = GestureStateMachine(confirm_frames=2)
+    assert feed(machine, [DOWN, UP, UP, UP, UP, UP]) == [2]
+    assert machine.state == GestureStateMachine.RAISED
+
+def test_state_machine_needs_a_release_before_firing_again():
+    machine = GestureStateMachine(confirm_frames=2)
+    # Dropping to between the thresholds is not a release
+    frames = [UP, UP, MIDDLE, MIDDLE, UP, UP, DOWN, DOWN, UP, UP]
+    assert feed(machine, frames) == [1, 9]
+
+def test_state_machine_ignores_single_frame_glitches():
+    machine = GestureStateMachine(confirm_frames=2)
+    assert feed(machine, [DOWN, UP, DOWN, UP, DOWN]) == []
+    # A one-frame dip does not count as lowering the arm
+    machine = GestureStateMachine(confirm_frames=2)
+    assert feed(machine, [UP, UP, DOWN, UP, UP, UP]) == [1]
+
+def test_deferred_raise_fires_on_next_raised_frame():
+    machine = GestureStateMachine(confirm_frames=3)
+    assert feed(machine, [UP, UP, UP]) == [2]
+    machine.defer()
+    assert feed(machine, [UP]) == [0]
+
+def test_default_rules_follow_the_arm_actions():
+    rules = create_gesture_rules({"left_arm_action": "next", "right_arm_action": "previous", "gesture_rules": []})
+    assert [(rule.name, rule.raised, rule.lowered, rule.action) for rule in rules] == [
+        ("Left arm", ("Left",), (), "next"), ("Right arm", ("Right",), (), "previous")]
+
+def test_default_rules_fire_each_arm_whatever_the_other_does(make_handyslides):
+    handyslides = make_handyslides(smoothing=False)
+    # Right hand holds a microphone just below the shoulder while the left arm is raised
+    times, landmarks, present = sequence((0.5, 0.6, 0.42), (0.5, 0.2, 0.42), (0.5, 0.6, 0.42))
+    assert [key for _, key in run_live(handyslides, times, landmarks, present)] == ["left"]
+
+def test_default_rules_send_no_home_key_for_both_arms(make_handyslides):
+    handyslides = make_handyslides(smoothing=False)
+    times, landmarks, present = sequence((0.5, 0.6, 0.6), (0.5, 0.2, 0.2), (0.5, 0.6, 0.6))
+    assert sorted(key for _, key in run_live(handyslides, times, landmarks, present)) == ["left", "right"]
+
+def test_both_arms_rule_is_opt_in(make_handyslides):
+    handyslides = make_handyslides(smoothing=False, gesture_rules=[
+        {"name": "Left arm", "raised": ["Left"], "lowered": ["Right"], "action": "previous"},
+        {"name": "Right arm", "raised": ["Right"], "lowered": ["Left"], "action": "next"},
+        {"name": "Both arms", "raised": ["Left", "Right"], "action": "first"}])
+    times, landmarks, present = sequence((0.5, 0.6, 0.6), (0.5, 0.2, 0.2), (0.5, 0.6, 0.6))
+    assert [key for _, key in run_live(handyslides, times, landmarks, present)] == ["home"]
+
+def test_held_rule_fires_only_after_its_hold_time(make_handyslides):
+    handyslides = make_handyslides(smoothing=False, gesture_rules=[
+        {"name": "Blank", "raised": ["Right"], "hold": 1.0, "action": "blank"}])
+    times, landmarks, present = sequence((0.5, 0.6, 0.6), (0.6, 0.6, 0.2), (0.5, 0.6, 0.6), (1.5, 0.6, 0.2))
+    presses = run_live(handyslides, times, landmarks, present)
+    assert [key for _, key in presses] == ["b"]
+    assert presses[0][0] >= 1.6 + 1.0
+
+def test_cooldown_defers_a_raise_instead_of_dropping_it(make_handyslides):
+    handyslides = make_handyslides(smoothing=False, cooldown=1.0)
+    times, landmarks, present = sequence((2.0, 0.6, 0.6), (0.3, 0.2, 0.6), (0.2, 0.6, 0.6), (1.5, 0.2, 0.6))
+    presses = run_live(handyslides, times, landmarks, present)
+    assert [key for _, key in presses] == ["left", "left"]
+    assert presses[1][0] - presses[0][0] >= 1.0
@@ -0,0 +1,70 @@
+import json
+import socket
+import threading
+import time
+
+from HandySlides import KeyDispatcher, create_key_sink
+
+class CallRecorder:
+    """Key sink that keeps (key, presses) per call, the first call waits until released"""
+    def __init__(self, fail_first=False):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fail_first = fail_first
+
+    def press(self, key, timestamp=None, presses=1):
+        first = not self.started.is_set()
+        self.started.set()
+        if first:
+            self.release.wait(5.0)
+            if self.fail_first:
+                raise OSError("key output gone")
+        self.calls.append((key, presses))
+
+def test_dispatcher_coalesces_presses_queued_during_an_injection():
+    sink = CallRecorder()
+    dispatcher = KeyDispatcher(sink).start()
+    dispatcher.press("right", 1.0)
+    assert sink.started.wait(5.0)
+    for key in ("right", "right", "left"):
+        dispatcher.press(key, 1.1)
+    sink.release.set()
+    dispatcher.close()
+    assert sink.calls == [("right", 1), ("right", 2), ("left", 1)]
+    assert dispatcher.events_sent == 4 and dispatcher.events_coalesced == 1
+
+def test_dispatcher_survives_a_failing_key_sink():
+    sink = CallRecorder(fail_first=True)
+    dispatcher = KeyDispatcher(sink, max_queue=2).start()
+    dispatcher.press("right", 1.0)
+    assert sink.started.wait(5.0)
+    sink.release.set()
+    dispatcher.press("left", 1.1)
+    dispatcher.close()
+    assert sink.calls == [("left", 1)]
+    assert dispatcher.events_failed == 1 and dispatcher.events_sent == 1
+
+def test_dispatcher_close_does_not_hang_on_a_stuck_sink():
+    sink = CallRecorder()
+    dispatcher = KeyDispatcher(sink, max_queue=1).start()
+    dispatcher.press("right", 1.0)
+    assert sink.started.wait(5.0)
+    dispatcher.press("right", 1.1)
+    dispatcher.press("right", 1.2)  # Queue full, dropped
+    start = time.monotonic()
+    dispatcher.close()
+    sink.release.set()
+    assert time.monotonic() - start < 15.0
+    assert dispatcher.events_dropped == 1
+
+def test_socket_key_output_sends_json_datagrams():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(5.0)
+    try:
+        sink = create_key_sink(f"socket:{receiver.getsockname()[1]}")
+        sink.press("right", 12.5, presses=2)
+        assert json.loads(receiver.recv(4096)) == {"key": "right", "presses": 2, "timestamp": 12.5}
+    finally:
+        receiver.close()
@@ -0,0 +1,57 @@
+import numpy as np
+from conftest import pose_array
+
+from HandySlides import MotionGate
+
+def scene(noise=0, square=None, seed=0):
+    """A 640x480 gray scene with sensor noise and optionally a moving white square at (x, y)"""
+    frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+    if noise:
+        frame = (frame + np.random.default_rng(seed).integers(-noise, noise + 1, frame.shape)).astype(np.uint8)
+    if square is not None:
+        x, y = square
+        frame[y:y + 120, x:x + 120] = 255
+    return frame
+
+def test_static_scene_is_only_inferred_every_static_interval():
+    gate = MotionGate(static_interval=1.0)
+    decisions = [gate.should_infer(scene(noise=4, seed=i), i / 30, at_rest=True) for i in range(90)]
+    # First frame, then once a second
+    assert [i for i, infer in enumerate(decisions) if infer] == [0, 30, 60]
+    assert gate.skipped_fraction() == 87 / 90
+
+def test_motion_brings_inference_back_at_once():
+    gate = MotionGate()
+    assert gate.should_infer(scene(), 0.0, at_rest=True)
+    assert not gate.should_infer(scene(), 0.1, at_rest=True)
+    assert gate.should_infer(scene(square=(200, 100)), 0.2, at_rest=True)
+    # The square is the new reference
+    assert not gate.should_infer(scene(square=(200, 100)), 0.3, at_rest=True)
+
+def test_gesture_in_progress_is_always_inferred():
+    gate = MotionGate()
+    assert all(gate.should_infer(scene(), i / 30, at_rest=False) for i in range(10))
+    assert gate.frames_skipped == 0
+
+def test_disabled_gate_infers_everything():
+    gate = MotionGate(enabled=False)
+    assert all(gate.should_infer(scene(), i / 30, at_rest=True) for i in range(10))
+    assert gate.describe() == "motion gate off"
+
+def test_new_frame_size_is_inferred():
+    gate = MotionGate()
+    assert gate.should_infer(scene(), 0.0, at_rest=True)
+    assert gate.should_infer(np.full((720, 1280, 3), 100, dtype=np.uint8), 0.1, at_rest=True)
+
+def test_raised_arm_keeps_inference_running(make_handyslides):
+    handyslides = make_handyslides(motion_gate=True, smoothing=False)
+    frame = scene()
+    array = pose_array(0.6, 0.2)
+    # Any MediaPipe result, the gesture logic reads the array
+    handyslides.handle_landmarks(object(), 0.0, array)
+    assert handyslides.should_infer(frame, 0.0)
+    assert handyslides.should_infer(frame, 0.05)
+    # Arms down again, the static scene is skipped
+    for timestamp in (0.1, 0.15):
+        handyslides.handle_landmarks(object(), timestamp, pose_array(0.6, 0.6))
+    assert not handyslides.should_infer(frame, 0.2)
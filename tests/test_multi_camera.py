@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+import HandySlides
+from HandySlides import ArbitratedKeySink, GestureRule, KeyArbiter, RecordingKeySink
+
+def test_arbiter_drops_the_same_raise_seen_by_another_camera():
+    sink = RecordingKeySink()
+    arbiter = KeyArbiter(sink, window=0.5)
+    front = ArbitratedKeySink(arbiter, "front", priority=1)
+    side = ArbitratedKeySink(arbiter, "side", priority=0)
+    assert front.press("right", 10.0) is True
+    assert side.press("right", 10.1) is False
+    # A lower priority camera cannot go the other way within the window either
+    assert side.press("left", 10.2) is False
+    assert sink.events == [(10.0, "right")]
+    assert arbiter.accepted == {"front": 1} and arbiter.rejected == {"side": 2}
+
+def test_arbiter_lets_higher_priority_and_later_presses_through():
+    sink = RecordingKeySink()
+    arbiter = KeyArbiter(sink, window=0.5)
+    assert arbiter.press("side", 0, "right", 10.0)
+    assert arbiter.press("front", 1, "left", 10.1)
+    # The same key is a duplicate whatever the priority
+    assert not arbiter.press("front", 1, "left", 10.2)
+    assert arbiter.press("side", 0, "right", 10.7)
+    assert [key for _, key in sink.events] == ["right", "left", "right"]
+
+def test_overruled_press_does_not_start_the_cooldown(make_handyslides):
+    sink = RecordingKeySink()
+    arbiter = KeyArbiter(sink, window=0.5)
+    front = make_handyslides(key_sink=ArbitratedKeySink(arbiter, "front", 1), cooldown=1.0)
+    side = make_handyslides(key_sink=ArbitratedKeySink(arbiter, "side", 0), cooldown=1.0)
+    next_slide = GestureRule("Right arm", raised=["Right"], action="next")
+    previous_slide = GestureRule("Left arm", raised=["Left"], action="previous")
+
+    front.act_on_gesture(next_slide, 10.0)
+    side.act_on_gesture(next_slide, 10.05)
+    assert side.last_press_time == 0
+    # Within a second of its own overruled press, but that press never went out
+    side.act_on_gesture(previous_slide, 10.7)
+    assert [key for _, key in sink.events] == ["right", "left"]
+    assert side.last_press_time == 10.7
+
+@pytest.fixture
+def started(monkeypatch, tmp_path):
+    """Run main() with some arguments, returns the settings detection would have started with"""
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(HandySlides, "run_detection", lambda config, *args: calls.append(config.settings))
+
+    def start(*argv):
+        monkeypatch.setattr(sys, "argv", ["HandySlides.py", *argv])
+        HandySlides.main()
+        return calls[-1]
+    return start
+
+def test_cameras_option_starts_a_multi_presenter_session(started):
+    settings = started("--cameras", "2,0")
+    assert settings["cameras"] == [{"index": 2, "priority": 2}, {"index": 0, "priority": 1}]
+    assert HandySlides.is_multi_camera(settings)
+
+def test_cameras_option_with_one_index_uses_that_camera(started):
+    settings = started("--cameras", "2")
+    assert settings["camera_index"] == 2
+    assert not HandySlides.is_multi_camera(settings)
+
+def test_cameras_option_rejects_anything_but_indexes(started):
+    with pytest.raises(SystemExit):
+        started("--cameras", "front,side")
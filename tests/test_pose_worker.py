@@ -0,0 +1,57 @@
+import queue
+from collections import deque
+
+import numpy as np
+import pytest
+
+from HandySlides import PoseWorkerProcess
+
+@pytest.mark.parametrize("settings, frame_shape, sent_shape", [
+    ({"inference_width": 640, "roi_tracking": True}, (2160, 3840, 3), (1080, 1920, 3)),
+    ({"inference_width": 640, "roi_tracking": True}, (1080, 1920, 3), (1080, 1920, 3)),
+    ({"inference_width": 640, "roi_tracking": False}, (1080, 1920, 3), (540, 960, 3)),
+    ({"inference_width": 640, "roi_tracking": False}, (720, 1280, 3), (360, 640, 3)),
+    ({"inference_width": 640, "roi_tracking": False}, (480, 640, 3), (480, 640, 3)),
+    ({"inference_width": 0, "roi_tracking": False}, (1080, 1920, 3), (1080, 1920, 3)),
+])
+def test_frames_are_halved_only_when_the_worker_does_not_need_more(settings, frame_shape, sent_shape):
+    assert PoseWorkerProcess(settings).scaled_shape(frame_shape) == sent_shape
+
+def worker_without_process(settings, frame_shape, slots=2):
+    """A PoseWorkerProcess with local buffers and request queue, to look at what submit() sends"""
+    worker = PoseWorkerProcess(settings, slots=slots)
+    worker.frame_shape = frame_shape
+    worker.slot_shape = worker.scaled_shape(frame_shape)
+    worker.frames = [np.zeros(worker.slot_shape, dtype=np.uint8) for _ in range(slots)]
+    worker.free_slots = deque(range(slots))
+    worker._requests = queue.Queue()
+    return worker
+
+def test_submit_writes_the_half_size_frame_into_the_slot():
+    worker = worker_without_process({"inference_width": 640, "roi_tracking": False}, (720, 1280, 3))
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    frame[:, 640:] = 200
+    assert worker.submit(frame)
+    assert worker._requests.get_nowait() == ("frame", 0, 360, 640)
+    assert worker.frames[0].shape == (360, 640, 3)
+    assert (worker.frames[0][:, :320] == 0).all() and (worker.frames[0][:, 320:] == 200).all()
+
+def test_submit_copies_full_size_frames_and_rejects_when_full():
+    worker = worker_without_process({"inference_width": 640, "roi_tracking": True}, (480, 640, 3), slots=1)
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    assert worker.submit(frame)
+    assert np.array_equal(worker.frames[0], frame)
+    # Later changes to the caller's frame do not reach the worker
+    frame[:] = 0
+    assert worker.frames[0].any()
+    assert not worker.submit(frame)
+    assert worker.frames_rejected == 1
+
+def test_submit_rejects_frames_larger_than_the_buffers():
+    worker = worker_without_process({"inference_width": 640, "roi_tracking": False}, (480, 640, 3))
+    assert not worker.submit(np.zeros((1080, 1920, 3), dtype=np.uint8))
+    assert worker.frames_rejected == 1
+    # A smaller frame uses the top left of a slot
+    assert worker.submit(np.full((240, 320, 3), 7, dtype=np.uint8))
+    assert worker._requests.get_nowait() == ("frame", 0, 240, 320)
+    assert (worker.frames[0][:240, :320] == 7).all()
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from conftest import run_live, sequence
+
+from HandySlides import LandmarkFilter, LandmarkRecorder, read_landmark_recording
+from replay_landmarks import split_sessions
+
+def talk():
+    """A few minutes of raises, holds, lost poses and quick repeats"""
+    rng = np.random.default_rng(1)
+    steps = [(1.0, 0.6, 0.6)]
+    for _ in range(40):
+        left, right = rng.choice([0.6, 0.2, 0.35, 0.45]), rng.choice([0.6, 0.2, 0.42])
+        steps.append((rng.uniform(0.1, 2.0), left, right))
+        if rng.random() < 0.1:
+            steps.append((0.3, None, None))
+    times, landmarks, present = sequence(*steps)
+    # Landmark jitter, so the smoothing has something to do
+    landmarks[present, :, :2] += rng.normal(0.0, 0.004, landmarks[present, :, :2].shape).astype(np.float32)
+    return times, landmarks, present
+
+@pytest.mark.parametrize("settings", [
+    {"smoothing": False},
+    {"smoothing": True},
+    {"smoothing": True, "cooldown": 0.8},
+    {"smoothing": False, "gesture_rules": [
+        {"name": "Both", "raised": ["Left", "Right"], "action": "first"},
+        {"name": "Blank", "raised": ["Right"], "hold": 1.0, "action": "blank"},
+        {"name": "Left", "raised": ["Left"], "lowered": ["Right"], "action": "previous"}]},
+])
+def test_replay_sends_the_same_keys_as_live_detection(make_handyslides, settings):
+    times, landmarks, present = talk()
+    live = run_live(make_handyslides(**settings), times, landmarks, present)
+    replayed = make_handyslides(**settings)
+    replayed.replay(times, landmarks, present)
+    assert len(live) > 5
+    assert replayed.key_sink.events == live
+
+def test_batch_filter_matches_the_live_filter():
+    times, landmarks, present = talk()
+    batch, batch_velocity = LandmarkFilter().filter_batch(times, landmarks, present)
+    live_filter = LandmarkFilter()
+    channels = ([11, 12, 15, 15, 16, 16], [1, 1, 0, 1, 0, 1])
+    for i in np.flatnonzero(present)[:500]:
+        if i == 0 or not present[i - 1]:
+            live_filter.reset()
+        filtered, velocity = live_filter.filter(landmarks[i], times[i])
+        assert np.array_equal(batch[i][channels], filtered[channels])
+        assert np.array_equal(batch_velocity[i][channels], velocity[channels])
+
+def test_recording_round_trip_keeps_sessions_apart(tmp_path):
+    path = str(tmp_path / "talk.hslm")
+    times, landmarks, present = sequence((1.0, 0.6, 0.6), (0.5, None, None), (1.0, 0.2, 0.6))
+    for offset in (1000.0, 1000.0 + 3 * 3600):
+        recorder = LandmarkRecorder(path, batch_size=7).open()
+        for timestamp, array, found in zip(times, landmarks, present):
+            recorder.write(offset + timestamp, array if found else None)
+        recorder.close()
+
+    recording = read_landmark_recording(path)
+    sessions = split_sessions(recording)
+    assert [len(session) for session in sessions] == [len(times), len(times)]
+    assert np.array_equal(sessions[1]["present"].astype(bool), present)
+    assert np.array_equal(sessions[1]["landmarks"][present], landmarks[present])
+
+def test_appending_after_a_crash_drops_the_partial_record(tmp_path):
+    path = str(tmp_path / "talk.hslm")
+    times, landmarks, present = sequence((0.5, 0.6, 0.6), (0.5, 0.2, 0.6))
+    recorder = LandmarkRecorder(path).open()
+    for timestamp, array in zip(times, landmarks):
+        recorder.write(1000.0 + timestamp, array)
+    recorder.close()
+    # Killed in the middle of a write
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 100)
+
+    recorder = LandmarkRecorder(path).open()
+    for timestamp, array in zip(times, landmarks):
+        recorder.write(2000.0 + timestamp, array)
+    recorder.close()
+
+    sessions = split_sessions(read_landmark_recording(path))
+    assert len(sessions) == 2
+    assert np.array_equal(sessions[1]["time"], 2000.0 + times)
+    assert sessions[1]["present"].all()
+    assert np.array_equal(sessions[1]["landmarks"], landmarks)
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from HandySlides import RoiPoseProcessor
+
+class MarkerPose:
+    """Pose stand-in that reports the corners and center of the white area in the image"""
+    def __init__(self):
+        self.shapes = []
+
+    def process(self, image):
+        self.shapes.append(image.shape)
+        ys, xs = np.nonzero(image[:, :, 0] > 127)
+        if len(xs) == 0:
+            return SimpleNamespace(pose_landmarks=None)
+        height, width = image.shape[:2]
+        # Pixel centers, like a model reporting normalized coordinates
+        points = [(xs.min(), ys.min()), (xs.max(), ys.min()), (xs.min(), ys.max()), (xs.max(), ys.max()),
+                  ((xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2)]
+        landmarks = [SimpleNamespace(x=(x + 0.5) / width, y=(y + 0.5) / height, z=0.1, visibility=1.0)
+                     for x, y in points]
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+def frame_with_marker(x0, y0, x1, y1, width=1280, height=720):
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[y0:y1, x0:x1] = 255
+    return frame
+
+def expected(x0, y0, x1, y1, width=1280, height=720):
+    return [((x + 0.5) / width, (y + 0.5) / height)
+            for x, y in [(x0, y0), (x1 - 1, y0), (x0, y1 - 1), (x1 - 1, y1 - 1), ((x0 + x1 - 1) / 2, (y0 + y1 - 1) / 2)]]
+
+def test_first_frame_is_downscaled_and_mapped_to_the_full_frame():
+    pose = MarkerPose()
+    processor = RoiPoseProcessor(pose, working_width=640)
+    results = processor.process(frame_with_marker(500, 300, 700, 500))
+    assert pose.shapes == [(360, 640, 3)]
+    got = [(lm.x, lm.y) for lm in results.pose_landmarks.landmark]
+    # Half resolution, so within a pixel of the full frame
+    assert np.allclose(got, expected(500, 300, 700, 500), atol=1.5 / 720)
+
+def test_crop_landmarks_are_mapped_back_to_full_frame_coordinates():
+    pose = MarkerPose()
+    processor = RoiPoseProcessor(pose, working_width=0, roi_padding=0.3)
+    processor.process(frame_with_marker(500, 300, 700, 500))
+    x0, y0, x1, y1 = processor.roi
+    assert (x1 - x0, y1 - y0) < (1280, 720)
+
+    results = processor.process(frame_with_marker(520, 310, 720, 510))
+    assert pose.shapes[-1] == (y1 - y0, x1 - x0, 3)
+    got = [(lm.x, lm.y) for lm in results.pose_landmarks.landmark]
+    assert np.allclose(got, expected(520, 310, 720, 510), atol=1e-6)
+    assert results.pose_landmarks.landmark[0].z == pytest.approx(0.1 * (x1 - x0) / 1280)
+
+def test_crop_follows_the_pose_and_lost_tracking_goes_back_to_the_full_frame():
+    pose = MarkerPose()
+    processor = RoiPoseProcessor(pose, working_width=0)
+    processor.process(frame_with_marker(500, 300, 700, 500))
+    first = processor.roi
+    processor.process(frame_with_marker(505, 302, 705, 502))
+    # Small moves keep the crop
+    assert processor.roi == first
+    processor.process(frame_with_marker(0, 0, 0, 0))
+    assert processor.roi is None
+    processor.process(frame_with_marker(900, 300, 1100, 500))
+    assert pose.shapes[-1] == (720, 1280, 3)
+    assert processor.roi[0] > first[0]
+
+def test_no_crop_when_the_pose_fills_the_frame():
+    processor = RoiPoseProcessor(MarkerPose(), working_width=0)
+    processor.process(frame_with_marker(100, 100, 1180, 700))
+    assert processor.roi is None
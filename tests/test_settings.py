@@ -0,0 +1,74 @@
+import json
+import time
+
+import pytest
+
+from HandySlides import ConfigWatcher, HandySlidesConfig, validate_settings
+
+def test_default_settings_are_valid():
+    assert validate_settings(HandySlidesConfig(None).settings) == []
+
+@pytest.mark.parametrize("changes, error", [
+    ({"right_arm_action": "up"}, "right_arm_action must be one of next, previous"),
+    ({"cooldown": "1"}, "cooldown has the wrong type"),
+    ({"confirm_frames": True}, "confirm_frames has the wrong type"),
+    ({"confirm_frames": 2.0}, "confirm_frames has the wrong type"),
+    ({"sensitivity": 1.5}, "sensitivity must be between 0.0 and 1.0"),
+    ({"gesture_rules": [{"raised": ["Head"], "action": "next"}]}, "gesture_rules: unknown arm 'Head'"),
+    ({"gesture_rules": [{"raised": ["Left"], "action": "jump"}]}, "gesture_rules: unknown action 'jump'"),
+    ({"gesture_rules": ["next"]}, "gesture_rules: "),
+])
+def test_invalid_values_are_reported(changes, error):
+    errors = validate_settings(dict(HandySlidesConfig(None).settings, **changes))
+    assert len(errors) == 1 and errors[0].startswith(error)
+
+def test_unknown_settings_are_left_alone():
+    assert validate_settings({"window_title": 3}) == []
+
+def test_new_settings_apply_on_the_next_frame(make_handyslides):
+    handyslides = make_handyslides()
+    gestures = handyslides.gestures
+    handyslides.apply_settings({"cooldown": 2.5, "confirm_frames": 4, "target_fps": 20, "motion_threshold": 0.02})
+    assert handyslides.config["cooldown"] == 2.5
+    assert handyslides.config_store.settings is handyslides.config
+    # Same rules, only the confirmation changed
+    assert handyslides.gestures is gestures
+    assert all(machine.confirm_frames == 4 for machine in gestures.machines)
+    assert handyslides.governor.budget == pytest.approx(1 / 20)
+    assert handyslides.motion_gate.threshold == 0.02
+
+def test_new_gesture_rules_replace_the_engine(make_handyslides):
+    handyslides = make_handyslides()
+    handyslides.apply_settings({"gesture_rules": [{"name": "Both", "raised": ["Left", "Right"], "action": "first"}]})
+    assert [rule.name for rule in handyslides.gestures.rules] == ["Both"]
+
+def test_startup_settings_wait_for_a_restart(make_handyslides, capsys):
+    handyslides = make_handyslides()
+    config = handyslides.config
+    handyslides.apply_settings({"headless": True, "key_output": "null"})
+    assert handyslides.config is config and not config["headless"]
+    assert "Restart HandySlides to apply: headless, key_output" in capsys.readouterr().out
+
+def wait_for_changes(watcher, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        changes = watcher.take()
+        if changes:
+            return changes
+        time.sleep(0.02)
+    return {}
+
+def test_watcher_reports_only_valid_changes(tmp_path, capsys):
+    path = tmp_path / "handyslides_config.json"
+    settings = dict(HandySlidesConfig(None).settings)
+    path.write_text(json.dumps(settings))
+    watcher = ConfigWatcher(str(path), interval=0.02).start()
+    try:
+        time.sleep(0.05)
+        path.write_text(json.dumps(dict(settings, cooldown=-1)))
+        assert wait_for_changes(watcher, 0.3) == {}
+        assert "cooldown must be between" in capsys.readouterr().out
+        path.write_text(json.dumps(dict(settings, cooldown=1.5, sensitivity=0.2)))
+        assert wait_for_changes(watcher) == {"cooldown": 1.5, "sensitivity": 0.2}
+    finally:
+        watcher.stop()